@@ -10,7 +10,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['tkinter'],  # 游戏不再使用 tkinter，少打包、少解压
     noarchive=False,
     optimize=0,
 )
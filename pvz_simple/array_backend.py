@@ -0,0 +1,488 @@
+"""
+可选的 NumPy 后端：按实体种类把状态存放在连续数组中（structure-of-arrays）
+
+- 植物、僵尸、子弹各用一个 EntityArrays 保存 x / 行 / 血量 / 速度 / 攻击状态等字段
+- 移动、出界清理、子弹命中僵尸、僵尸啃植物都是每帧一次的批量数组运算
+- 精灵对象只作为渲染用的“视图”（EntityView），由 sync_views() 按需同步
+
+对外接口与 simulation.Simulation 相同（add_plant / remove_plant_at / step / run ...），
+规则与 Simulation 一致；同一帧内多个僵尸同时接触多棵植物时，目标的选择顺序可能不同。
+实体数量上限同样生效；僵尸群合并只用于 sprite 后端，这里每只僵尸只是数组中的一行，不需要合并。
+需要安装 numpy：pip install numpy
+"""
+
+import random
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy 是可选依赖，只有选用该后端时才需要
+    np = None
+
+from settings import (
+    PLANT_MAX_HP,
+    PLANT_FIRE_INTERVAL,
+    ZOMBIE_MAX_HP,
+    ZOMBIE_SPEED,
+    BULLET_SPEED,
+    BULLET_DAMAGE,
+    ZOMBIE_SPAWN_INTERVAL,
+    SIM_TICK_MS,
+    MAX_LIVE_ZOMBIES,
+    MAX_LIVE_BULLETS,
+)
+from grid import Grid
+from entities import Plant, Zombie, Bullet
+from assets import SPRITE_CACHE
+from profiler import (
+    PHASE_SPAWN,
+    PHASE_UPDATE,
+    PHASE_FIRE,
+    PHASE_BULLET_HIT,
+    PHASE_ZOMBIE_BITE,
+)
+
+# 各实体矩形尺寸（与 entities.py 中的图像大小一致）
+PLANT_W, PLANT_H = 50, 60
+ZOMBIE_W, ZOMBIE_H = 60, 80
+BULLET_W, BULLET_H = 10, 10
+
+# 同步视图时视野上方多留的高度，容纳实体上方的血量条
+BAR_MARGIN = 20
+
+# 排序键中“行”的跨度：key = row * LANE_KEY_STRIDE + x，保证不同行的键互不重叠
+LANE_KEY_STRIDE = 1_000_000.0
+
+# 与 Zombie 中的设定一致
+ZOMBIE_ATTACK_DPS = 20
+
+
+class EntityArrays:
+    """
+    一种实体的全部字段，每个字段一个 NumPy 数组，按下标对齐
+    - arrays["x"] 取得当前存活部分的视图（长度为 len(arrays)）
+    - 容量不够时按 2 倍扩容，删除时用布尔掩码整体压缩
+    """
+
+    def __init__(self, fields, capacity=64):
+        """
+        fields: {字段名: dtype}
+        """
+        self.count = 0
+        self._data = {name: np.zeros(capacity, dtype) for name, dtype in fields.items()}
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def __getitem__(self, name):
+        return self._data[name][:self.count]
+
+    def __setitem__(self, name, value):
+        self._data[name][:self.count] = value
+
+    def _reserve(self, extra):
+        capacity = len(next(iter(self._data.values())))
+        needed = self.count + extra
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, arr in self._data.items():
+            grown = np.zeros(capacity, arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            self._data[name] = grown
+
+    def extend(self, n, **values):
+        """
+        追加 n 个实体；values 中每个字段可以是标量或长度为 n 的数组
+        未给出的字段填 0
+        """
+        if n <= 0:
+            return
+        self._reserve(n)
+        start, end = self.count, self.count + n
+        for name, arr in self._data.items():
+            arr[start:end] = values.get(name, 0)
+        self.count = end
+
+    def compact(self, keep):
+        """
+        只保留 keep（布尔数组）为 True 的实体，保持原有相对顺序
+        """
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return
+        for arr in self._data.values():
+            arr[:kept] = arr[:self.count][keep]
+        self.count = kept
+
+
+class EntityView(pygame.sprite.Sprite):
+    """
+    渲染用的轻量精灵：只有 image / rect / hp / max_hp，状态由数组同步过来
+    """
+
+    def __init__(self, image, max_hp):
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect()
+        self.max_hp = max_hp
+        self.hp = max_hp
+
+
+class ArraySimulation:
+    """
+    NumPy 数组版的游戏逻辑模拟，接口与 Simulation 相同
+    """
+
+    backend = "numpy"
+
+    def __init__(self, grid=None, seed=None, endless=False):
+        """
+        grid: 草坪网格对象，不传则新建一个
+        seed: 随机种子，相同种子生成相同的僵尸序列
+        endless: 为 True 时僵尸突破防线不结束游戏，只移除该僵尸并计数
+        """
+        if np is None:
+            raise ImportError("需要安装 numpy 库：pip install numpy")
+
+        self.grid = grid if grid is not None else Grid()
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # 每行中心的 y 坐标
+        self.row_centery = np.array(
+            [self.grid.get_cell_center(row, 0)[1] for row in range(self.grid.rows)], dtype=np.float64
+        )
+
+        # 实体数组（x 均为矩形左边缘，与 pygame.Rect 的整数移动保持一致）
+        self.plant_arrays = EntityArrays({
+            "id": np.int64, "row": np.int32, "col": np.int32,
+            "x": np.float64, "hp": np.float64, "last_fire": np.float64,
+        })
+        self.zombie_arrays = EntityArrays({
+            "id": np.int64, "row": np.int32, "x": np.float64, "hp": np.float64,
+            "speed": np.float64, "attack_dps": np.float64, "attacking": np.bool_,
+        })
+        self.bullet_arrays = EntityArrays({
+            "id": np.int64, "row": np.int32, "x": np.float64,
+            "speed": np.float64, "damage": np.float64,
+        })
+        self._next_id = 0
+
+        # 每个格子的植物在 plant_arrays 中的下标，-1 表示空
+        self.plant_slot = np.full((self.grid.rows, self.grid.cols), -1, dtype=np.int64)
+
+        # 渲染视图：与 Simulation 一样提供三个精灵组
+        self.plants = pygame.sprite.Group()
+        self.zombies = pygame.sprite.Group()
+        self.bullets = pygame.sprite.Group()
+        self._views = {}
+
+        # 模拟时钟（毫秒）和已经推进的帧数
+        self.time = 0
+        self.tick_count = 0
+
+        # 僵尸生成计时器
+        self.last_zombie_spawn_time = 0
+
+        # 游戏结束标志
+        self.game_over = False
+        self.endless = endless
+        # 突破防线的僵尸数量和第一次突破时的帧号
+        self.breaches = 0
+        self.breach_tick = None
+        # 被子弹消灭的僵尸数量
+        self.kills = 0
+        # 因达到实体数量上限而没有生成的僵尸
+        self.spawns_skipped = 0
+
+        # 分阶段耗时统计（profiler.FrameProfiler），None 表示不统计
+        self.profiler = None
+
+    def _new_ids(self, n):
+        ids = np.arange(self._next_id, self._next_id + n, dtype=np.int64)
+        self._next_id += n
+        return ids
+
+    def _rebuild_plant_slots(self):
+        p = self.plant_arrays
+        self.plant_slot.fill(-1)
+        self.plant_slot[p["row"], p["col"]] = np.arange(len(p))
+
+    def add_plant(self, row, col):
+        """
+        在格子 (row, col) 种一棵植物
+        格子已有植物时返回 None；否则返回植物的 id
+        """
+        if self.plant_slot[row, col] >= 0:
+            return None
+        centerx, _ = self.grid.get_cell_center(row, col)
+        plant_id = int(self._new_ids(1)[0])
+        self.plant_arrays.extend(
+            1, id=plant_id, row=row, col=col,
+            x=centerx - PLANT_W // 2, hp=PLANT_MAX_HP, last_fire=0,
+        )
+        self.plant_slot[row, col] = len(self.plant_arrays) - 1
+        return plant_id
+
+    def remove_plant_at(self, pos):
+        """
+        铲子：移除像素坐标 pos 所在格子里的植物
+        返回 True 表示移除了一棵植物
+        """
+        cell_indices = self.grid.get_cell_indices_from_pos(pos)
+        if cell_indices is None:
+            return False
+        index = self.plant_slot[cell_indices]
+        if index < 0:
+            return False
+        p = self.plant_arrays
+        keep = np.ones(len(p), dtype=bool)
+        keep[index] = False
+        p.compact(keep)
+        self._rebuild_plant_slots()
+        return True
+
+    def zombie_total(self):
+        """
+        返回僵尸总数（这个后端不合并僵尸群，即僵尸数组的长度）
+        """
+        return len(self.zombie_arrays)
+
+    def lane_zombie_count(self, row):
+        """
+        返回第 row 行当前存活的僵尸数量
+        """
+        return int(np.count_nonzero(self.zombie_arrays["row"] == row))
+
+    def step(self, dt=SIM_TICK_MS):
+        """
+        推进一帧游戏逻辑，每个阶段都是对整列数组的一次批量运算
+        dt: 本帧经过的模拟毫秒数
+        """
+        if self.game_over:
+            return
+
+        self.time += dt
+        self.tick_count += 1
+        current_time = self.time
+        prof = self.profiler
+        plants, zombies, bullets = self.plant_arrays, self.zombie_arrays, self.bullet_arrays
+
+        # 2.1 生成僵尸（根据时间间隔）
+        if current_time - self.last_zombie_spawn_time >= ZOMBIE_SPAWN_INTERVAL:
+            self.last_zombie_spawn_time = current_time
+            spawn_row = self.rng.randint(0, self.grid.rows - 1)
+            spawn_x = self.grid.world_width - 20
+            if MAX_LIVE_ZOMBIES is None or len(zombies) < MAX_LIVE_ZOMBIES:
+                zombies.extend(
+                    1, id=self._new_ids(1), row=spawn_row, x=spawn_x - ZOMBIE_W // 2,
+                    hp=ZOMBIE_MAX_HP, speed=ZOMBIE_SPEED, attack_dps=ZOMBIE_ATTACK_DPS,
+                )
+            else:
+                self.spawns_skipped += 1
+        if prof is not None:
+            prof.mark(PHASE_SPAWN)
+
+        # 2.2 移动：没在攻击的僵尸向左走，子弹向右飞，飞出屏幕右侧的子弹清理掉
+        # 速度单位是“像素/标准帧”，位移按 dt 折算
+        scale = dt / SIM_TICK_MS
+        zombies["x"] = zombies["x"] - np.where(zombies["attacking"], 0.0, zombies["speed"]) * scale
+        bullets["x"] = bullets["x"] + bullets["speed"] * scale
+        bullets.compact(bullets["x"] <= self.grid.world_width)
+        if prof is not None:
+            prof.mark(PHASE_UPDATE)
+
+        # 2.3 植物自动开火：本行有僵尸且冷却结束
+        lane_counts = np.bincount(zombies["row"], minlength=self.grid.rows)
+        firing = (lane_counts[plants["row"]] > 0) & (
+            current_time - plants["last_fire"] >= PLANT_FIRE_INTERVAL
+        )
+        if MAX_LIVE_BULLETS is not None:
+            # 子弹数量上限：只有排在前面的植物开火，其余保持冷却结束的状态
+            firing &= np.cumsum(firing) <= MAX_LIVE_BULLETS - len(bullets)
+        n_fire = int(np.count_nonzero(firing))
+        if n_fire:
+            plants["last_fire"] = np.where(firing, current_time, plants["last_fire"])
+            bullets.extend(
+                n_fire, id=self._new_ids(n_fire), row=plants["row"][firing],
+                x=plants["x"][firing] + PLANT_W - BULLET_W // 2,
+                speed=BULLET_SPEED, damage=BULLET_DAMAGE,
+            )
+        if prof is not None:
+            prof.mark(PHASE_FIRE)
+
+        # 2.4 子弹与僵尸碰撞：僵尸按 (行, x) 排序后，用二分查找得到每颗子弹覆盖的僵尸区间
+        if len(bullets) and len(zombies):
+            order = np.lexsort((zombies["x"], zombies["row"]))
+            keys = zombies["row"][order] * LANE_KEY_STRIDE + zombies["x"][order]
+            b_keys = bullets["row"] * LANE_KEY_STRIDE + bullets["x"]
+            # 矩形重叠：zombie.left < bullet.right 且 bullet.left < zombie.right
+            lo = np.searchsorted(keys, b_keys - ZOMBIE_W, side="right")
+            hi = np.searchsorted(keys, b_keys + BULLET_W, side="left")
+            hit = hi > lo
+            if hit.any():
+                # 差分数组：每颗子弹的伤害加到它覆盖的整段僵尸上
+                diff = np.zeros(len(zombies) + 1)
+                np.add.at(diff, lo[hit], bullets["damage"][hit])
+                np.subtract.at(diff, hi[hit], bullets["damage"][hit])
+                damage = np.empty(len(zombies))
+                damage[order] = np.cumsum(diff[:-1])
+                zombies["hp"] = zombies["hp"] - damage
+                bullets.compact(~hit)
+                alive = zombies["hp"] > 0
+                self.kills += len(zombies) - int(np.count_nonzero(alive))
+                zombies.compact(alive)
+        if prof is not None:
+            prof.mark(PHASE_BULLET_HIT)
+
+        # 2.5 僵尸与植物碰撞：到达左侧判定结束；与本行重叠的植物被啃
+        breached = zombies["x"] <= 0
+        n_breached = int(np.count_nonzero(breached))
+        if n_breached:
+            self.breaches += n_breached
+            if self.breach_tick is None:
+                self.breach_tick = self.tick_count
+            if self.endless:
+                zombies.compact(~breached)
+            else:
+                self.game_over = True
+        attacking = np.zeros(len(zombies), dtype=bool)
+        if len(zombies) and len(plants):
+            order = np.lexsort((plants["x"], plants["row"]))
+            keys = plants["row"][order] * LANE_KEY_STRIDE + plants["x"][order]
+            z_keys = zombies["row"] * LANE_KEY_STRIDE + zombies["x"]
+            lo = np.searchsorted(keys, z_keys - PLANT_W, side="right")
+            hi = np.searchsorted(keys, z_keys + ZOMBIE_W, side="left")
+            attacking = hi > lo
+            if attacking.any():
+                # 一个僵尸只啃一棵植物：取重叠区间中最右边的那棵（走过来最先碰到的）
+                target = order[hi[attacking] - 1]
+                bite = zombies["attack_dps"][attacking] * (dt / 1000.0)
+                plants["hp"] = plants["hp"] - np.bincount(
+                    target, weights=bite, minlength=len(plants)
+                )
+                alive = plants["hp"] > 0
+                if not alive.all():
+                    plants.compact(alive)
+                    # 2.6 植物死亡后同步清理 plant_slot
+                    self._rebuild_plant_slots()
+        zombies["attacking"] = attacking
+        if prof is not None:
+            prof.mark(PHASE_ZOMBIE_BITE)
+
+    def run(self, ticks, dt=SIM_TICK_MS):
+        """
+        连续推进 ticks 帧（游戏结束时提前停止）
+        返回实际推进的帧数
+        """
+        for i in range(ticks):
+            if self.game_over:
+                return i
+            self.step(dt)
+        return ticks
+
+    def _view_images(self):
+        # 与精灵后端共用同一份图像缓存
+        return {
+            "plant": SPRITE_CACHE.get("plant", Plant.build_image),
+            "zombie": SPRITE_CACHE.get("zombie", Zombie.build_image),
+            "bullet": SPRITE_CACHE.get("bullet", Bullet.build_image),
+        }
+
+    def _sync_group(self, group, arrays, image, max_hp, width, height, view=None):
+        views = self._views
+        xs = arrays["x"]
+        tops = self.row_centery[arrays["row"]] - height // 2
+        hps = arrays["hp"] if "hp" in arrays else None
+        ids = arrays["id"]
+        if view is not None:
+            # 只为视野内的实体保留视图（血条在实体上方，上边多留 BAR_MARGIN）
+            visible = (
+                (xs + width > view.left) & (xs < view.right)
+                & (tops + height > view.top - BAR_MARGIN) & (tops < view.bottom)
+            )
+            ids, xs, tops = ids[visible], xs[visible], tops[visible]
+            if hps is not None:
+                hps = hps[visible]
+        ids = ids.tolist()
+        lefts = xs.tolist()
+        tops = tops.tolist()
+        hps = hps.tolist() if hps is not None else None
+        alive = set(ids)
+        for sprite in group.sprites():
+            if sprite.entity_id not in alive:
+                sprite.kill()
+                del views[sprite.entity_id]
+        for i, entity_id in enumerate(ids):
+            sprite = views.get(entity_id)
+            if sprite is None:
+                sprite = EntityView(image, max_hp)
+                sprite.entity_id = entity_id
+                views[entity_id] = sprite
+                group.add(sprite)
+            sprite.rect.x = round(lefts[i])
+            sprite.rect.y = int(tops[i])
+            if hps is not None:
+                sprite.hp = hps[i]
+
+    def sync_views(self, view=None):
+        """
+        把数组中的状态同步到渲染用的精灵组（每个渲染帧调用一次即可）
+        view: 摄像机可见区域（世界坐标），传入时只同步视野内的实体，精灵组里也只有这些实体
+        """
+        images = self._view_images()
+        self._sync_group(self.plants, self.plant_arrays, images["plant"], PLANT_MAX_HP, PLANT_W, PLANT_H, view)
+        self._sync_group(self.zombies, self.zombie_arrays, images["zombie"], ZOMBIE_MAX_HP, ZOMBIE_W, ZOMBIE_H, view)
+        self._sync_group(self.bullets, self.bullet_arrays, images["bullet"], 0, BULLET_W, BULLET_H, view)
+
+    def entity_counts(self):
+        """
+        返回 (植物数, 僵尸数, 子弹数)；精灵组只是视图，可能只包含视野内的实体
+        """
+        return len(self.plant_arrays), self.zombie_total(), len(self.bullet_arrays)
+
+    def export_entities(self):
+        """
+        按字段导出全部实体（供 savestate.snapshot 使用），格式与 Simulation 相同
+        """
+        p, z, b = self.plant_arrays, self.zombie_arrays, self.bullet_arrays
+        return {
+            "plants": {"row": p["row"], "col": p["col"], "hp": p["hp"], "last_fire": p["last_fire"]},
+            "zombies": {
+                "row": z["row"], "x": z["x"], "hp": z["hp"],
+                "speed": z["speed"], "attacking": z["attacking"],
+            },
+            "bullets": {"row": b["row"], "x": b["x"], "speed": b["speed"], "damage": b["damage"]},
+        }
+
+    def import_entities(self, entities):
+        """
+        按 export_entities() 的格式重建全部实体（供 savestate.restore 使用，模拟应为刚创建的状态）
+        """
+        p = {name: np.asarray(values) for name, values in entities["plants"].items()}
+        n = len(p["row"])
+        size = self.grid.cell_size
+        self.plant_arrays.extend(
+            n, id=self._new_ids(n), row=p["row"], col=p["col"],
+            x=self.grid.offset_x + p["col"] * size + size // 2 - PLANT_W // 2,
+            hp=p["hp"], last_fire=p["last_fire"],
+        )
+        self._rebuild_plant_slots()
+
+        z = {name: np.asarray(values) for name, values in entities["zombies"].items()}
+        n = len(z["row"])
+        self.zombie_arrays.extend(
+            n, id=self._new_ids(n), row=z["row"], x=z["x"], hp=z["hp"],
+            speed=z["speed"], attack_dps=ZOMBIE_ATTACK_DPS, attacking=z["attacking"] != 0,
+        )
+
+        b = {name: np.asarray(values) for name, values in entities["bullets"].items()}
+        n = len(b["row"])
+        self.bullet_arrays.extend(
+            n, id=self._new_ids(n), row=b["row"], x=b["x"], speed=b["speed"], damage=b["damage"],
+        )
@@ -0,0 +1,107 @@
+"""
+共享的预渲染图像缓存：
+- 同一种外观只绘制一次，所有实例共用同一个 Surface
+- 有显示窗口时用 convert_alpha() 转成屏幕像素格式，blit 更快
+- 记录命中 / 未命中次数和占用内存，方便确认缓存是否生效
+- 界面字体的查找结果缓存到 FONT_CACHE_FILE，启动时不必每次都尝试字体路径和扫描系统字体
+"""
+
+import os
+
+import pygame
+
+from settings import FONT_CANDIDATES, FONT_FALLBACK_NAME, FONT_CACHE_FILE
+
+class ImageCache:
+    """
+    按 key 缓存图像：get(key, builder) 第一次调用 builder() 生成图像，之后直接复用
+    """
+
+    def __init__(self):
+        self._images = {}
+        # 已经转换成显示像素格式的 key
+        self._converted = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, builder):
+        """
+        取出 key 对应的图像，不存在时用 builder() 生成
+        """
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            image = builder()
+            self._images[key] = image
+        else:
+            self.hits += 1
+
+        # 窗口可能在图像生成之后才创建，所以每次取用时检查是否还需要转换
+        if key not in self._converted and pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+            self._images[key] = image
+            self._converted.add(key)
+        return image
+
+    def memory_bytes(self):
+        """
+        缓存中所有图像像素数据占用的字节数
+        """
+        return sum(image.get_pitch() * image.get_height() for image in self._images.values())
+
+    def stats(self):
+        """
+        返回缓存统计：命中、未命中、条目数、占用字节数
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._images),
+            "bytes": self.memory_bytes(),
+        }
+
+    def clear(self):
+        self._images.clear()
+        self._converted.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# 植物、僵尸、子弹共用的精灵图像缓存
+SPRITE_CACHE = ImageCache()
+
+
+def resolve_font_path():
+    """
+    返回界面字体文件路径；空字符串表示没有找到，使用 pygame 默认字体
+    优先读取缓存文件（缓存的字体文件已不存在时重新查找）
+    """
+    cache_path = os.path.expanduser(FONT_CACHE_FILE)
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = f.read().strip()
+        if not cached or os.path.exists(cached):
+            return cached
+    except OSError:
+        pass
+
+    path = next((p for p in FONT_CANDIDATES if os.path.exists(p)), None)
+    if path is None:
+        # 按名字匹配会扫描一遍系统字体，是启动时最慢的一步，所以结果要缓存
+        path = pygame.font.match_font(FONT_FALLBACK_NAME) or ""
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            f.write(path)
+    except OSError:
+        pass
+    return path
+
+def load_font(size):
+    """
+    按缓存的查找结果加载界面字体
+    """
+    path = resolve_font_path()
+    try:
+        return pygame.font.Font(path or None, size)
+    except OSError:
+        return pygame.font.Font(None, size)
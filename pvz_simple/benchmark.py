@@ -0,0 +1,223 @@
+"""
+可复现的游戏循环性能测试：
+- 在 SDL dummy 视频驱动下运行预设场景，不需要真实窗口
+- 逻辑阶段（sim.step）和绘制阶段（Renderer + Hud）分别计时
+- 报告逻辑帧/秒、每帧耗时 p50/p95/p99、实体数量峰值和进程内存峰值
+- 每个场景在单独的子进程中运行，内存峰值只包含这个场景（不会带上之前场景的峰值）
+- 结果写入 JSON 文件，方便在不同版本之间对比
+
+命令行用法：
+    python benchmark.py                      # 运行全部场景
+    python benchmark.py full_lawn horde_10min --output bench.json
+    python benchmark.py --backend numpy --no-render
+    python benchmark.py --backend lite --no-render
+    python benchmark.py full_lawn --lawn 20x200  # 大草坪压力测试
+"""
+
+import os
+
+# 必须在导入 pygame 之前设置，保证没有显示器时也能运行
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pygame
+
+from settings import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    GRID_ROWS,
+    GRID_COLS,
+    SIM_TICK_MS,
+    SIM_BACKEND,
+)
+from grid import Grid, parse_lawn_size
+from simulation import create_simulation
+
+def _ticks_for(seconds):
+    return int(seconds * 1000 / SIM_TICK_MS)
+
+def _plant_full_lawn(sim, tick):
+    if tick == 0:
+        for row in range(sim.grid.rows):
+            for col in range(sim.grid.cols):
+                sim.add_plant(row, col)
+
+def _plant_front_columns(sim, tick):
+    if tick == 0:
+        for row in range(sim.grid.rows):
+            for col in range(3):
+                sim.add_plant(row, col)
+
+def _shovel_spam(sim, tick):
+    # 每帧在一个格子上种植或铲除，轮流扫过整片草坪
+    cell = tick % (sim.grid.rows * sim.grid.cols)
+    row, col = divmod(cell, sim.grid.cols)
+    if sim.add_plant(row, col) is None:
+        sim.remove_plant_at(sim.grid.get_cell_center(row, col))
+
+# 场景：名称 -> (说明, 游戏时长（秒）, 每帧调用的输入脚本)
+# 所有场景都以 endless 模式运行：突破防线的僵尸被移除，游戏不会提前结束
+# 说明中的草坪大小是默认值，可以用 --lawn 换成更大的草坪
+SCENARIOS = {
+    "full_lawn": ("种满整片草坪（默认 5x9），60 秒", 60, _plant_full_lawn),
+    "horde_10min": ("前三列植物，10 分钟持续刷怪", 600, _plant_front_columns),
+    "shovel_spam": ("每帧种植或铲除一次，60 秒", 60, _shovel_spam),
+    "empty_lawn": ("没有植物，僵尸直接走到底，60 秒", 60, lambda sim, tick: None),
+}
+
+def percentile(samples, q):
+    """
+    返回 samples 的 q 分位数（0~100），samples 为空时返回 0
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples_ns):
+    """
+    把纳秒耗时样本汇总为毫秒统计
+    """
+    samples_ms = [s / 1e6 for s in samples_ns]
+    return {
+        "frames": len(samples_ms),
+        "total_ms": sum(samples_ms),
+        "mean_ms": sum(samples_ms) / len(samples_ms) if samples_ms else 0.0,
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+        "max_ms": max(samples_ms) if samples_ms else 0.0,
+    }
+
+def peak_rss_kb():
+    """
+    当前进程的内存峰值（KB），只增不减，所以每个场景要在自己的进程中调用；不支持的平台（如 Windows 上没有 resource 模块）返回 None
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 上单位是字节，Linux 上是 KB
+    return usage // 1024 if platform.system() == "Darwin" else usage
+
+def run_scenario(name, backend=SIM_BACKEND, render=True, seed=0, lawn=(GRID_ROWS, GRID_COLS)):
+    """
+    运行一个场景，返回结果字典
+    lawn: 草坪大小 (行数, 列数)；绘制时摄像机停在左上角，只画窗口内可见的部分
+    """
+    description, seconds, script = SCENARIOS[name]
+    sim = create_simulation(Grid(*lawn), backend=backend, seed=seed, endless=True)
+
+    renderer = hud = None
+    if render:
+        from render import Renderer
+        from hud import Hud
+
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        renderer = Renderer(screen, sim.grid)
+        hud = Hud(pygame.font.Font(None, 24))
+
+    logic_ns = []
+    render_ns = []
+    peaks = {"plants": 0, "zombies": 0, "bullets": 0}
+    ticks = _ticks_for(seconds)
+
+    for tick in range(ticks):
+        start = time.perf_counter_ns()
+        script(sim, tick)
+        sim.step(SIM_TICK_MS)
+        logic_ns.append(time.perf_counter_ns() - start)
+
+        if render:
+            start = time.perf_counter_ns()
+            sim.sync_views(renderer.camera.rect)
+            renderer.begin_frame()
+            renderer.draw_entities(sim.plants, sim.zombies, sim.bullets)
+            hud.draw(renderer, False, False, sim.game_over, (0, 0))
+            renderer.end_frame()
+            render_ns.append(time.perf_counter_ns() - start)
+
+        plants, zombies, bullets = sim.entity_counts()
+        peaks["plants"] = max(peaks["plants"], plants)
+        peaks["zombies"] = max(peaks["zombies"], zombies)
+        peaks["bullets"] = max(peaks["bullets"], bullets)
+
+    if render:
+        pygame.display.quit()
+
+    logic = summarize(logic_ns)
+    return {
+        "scenario": name,
+        "description": description,
+        "backend": sim.backend,
+        "render": render,
+        "seed": seed,
+        "lawn": list(lawn),
+        "ticks": ticks,
+        "game_seconds": sim.time / 1000,
+        "ticks_per_sec": ticks / (logic["total_ms"] / 1000) if logic["total_ms"] else 0.0,
+        "logic": logic,
+        "render_phase": summarize(render_ns) if render else None,
+        "peak_entities": peaks,
+        "breaches": sim.breaches,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+def run_scenario_isolated(*args):
+    """
+    在新启动的子进程中运行 run_scenario()，进程内存峰值只属于这一个场景
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_scenario, *args).result()
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="游戏循环性能测试")
+    parser.add_argument("scenarios", nargs="*", help=f"要运行的场景（默认全部）：{', '.join(SCENARIOS)}")
+    parser.add_argument("--backend", default=SIM_BACKEND, choices=["sprite", "numpy", "lite"])
+    parser.add_argument("--no-render", action="store_true", help="只测逻辑，不绘制")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lawn", metavar="ROWSxCOLS", type=parse_lawn_size, default=(GRID_ROWS, GRID_COLS),
+                        help=f"草坪大小（默认 {GRID_ROWS}x{GRID_COLS}）")
+    parser.add_argument("--output", default="bench_output.json", help="结果 JSON 文件路径")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"未知场景：{', '.join(unknown)}")
+    if args.backend == "lite" and not args.no_render:
+        parser.error("lite 后端的实体没有图像，需要配合 --no-render 使用")
+
+    results = []
+    for name in args.scenarios or list(SCENARIOS):
+        result = run_scenario_isolated(name, args.backend, not args.no_render, args.seed, args.lawn)
+        results.append(result)
+        render_p95 = result["render_phase"]["p95_ms"] if result["render_phase"] else 0.0
+        print(
+            f"{name:12s} {result['ticks_per_sec']:9.0f} 帧/秒  "
+            f"逻辑 p95 {result['logic']['p95_ms']:.3f} ms  绘制 p95 {render_p95:.3f} ms  "
+            f"僵尸峰值 {result['peak_entities']['zombies']}  子弹峰值 {result['peak_entities']['bullets']}"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+摄像机（视口）：草坪比窗口大时，只显示世界坐标中的一块窗口大小的区域
+
+- 实体、格子、鼠标点击统一使用世界坐标，只在绘制时减去摄像机位置换算成屏幕坐标
+- 默认大小的草坪正好铺满窗口，摄像机停在 (0, 0) 不动，世界坐标就是屏幕坐标
+"""
+
+import pygame
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+class Camera:
+    def __init__(self, world_width, world_height, view_width=SCREEN_WIDTH, view_height=SCREEN_HEIGHT):
+        """
+        world_width / world_height: 世界大小（一般取 Grid.world_width / world_height）
+        view_width / view_height: 视口大小，即窗口大小
+        """
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = view_width
+        self.view_height = view_height
+        # 浮点位置，按 dt 滚动时不丢小数部分；x / y 是取整后的像素位置
+        self._fx = 0.0
+        self._fy = 0.0
+        self.x = 0
+        self.y = 0
+
+    @property
+    def rect(self):
+        """
+        当前可见区域（世界坐标）
+        """
+        return pygame.Rect(self.x, self.y, self.view_width, self.view_height)
+
+    def move_to(self, x, y):
+        """
+        把视口左上角移动到世界坐标 (x, y)，超出世界范围时贴边
+        返回视口是否真的移动了
+        """
+        self._fx = max(0.0, min(x, self.world_width - self.view_width))
+        self._fy = max(0.0, min(y, self.world_height - self.view_height))
+        old = (self.x, self.y)
+        self.x = round(self._fx)
+        self.y = round(self._fy)
+        return (self.x, self.y) != old
+
+    def scroll(self, dx, dy):
+        """
+        按像素滚动视口
+        """
+        return self.move_to(self._fx + dx, self._fy + dy)
+
+    def to_world(self, pos):
+        """
+        屏幕坐标 -> 世界坐标（例如鼠标位置）
+        """
+        return (pos[0] + self.x, pos[1] + self.y)
@@ -4,8 +4,13 @@
 - Plant（植物）
 - Zombie（僵尸）
 - Bullet（子弹）
+- BulletPool（子弹对象池）
 
 全部继承自 pygame.sprite.Sprite，方便使用分组更新和碰撞检测。
+外观图像只绘制一次，存放在 assets.SPRITE_CACHE 中由所有实例共用。
+
+行为（开火、移动、受伤、僵尸群合并……）写在 PlantBehavior / ZombieBehavior / BulletBehavior 中，
+它们不带实例状态（__slots__ = ()），同时被这里的精灵类和 lite.py 中无图像的轻量实体继承。
 """
 
 import pygame
@@ -16,36 +21,35 @@ from settings import (
     ZOMBIE_SPEED,
     BULLET_SPEED,
     BULLET_DAMAGE,
+    BULLET_POOL_CAPACITY,
     BLUE,
     DARK_RED,
     YELLOW,
     BLACK,
     SCREEN_WIDTH,
+    SIM_TICK_MS,
 )
+from assets import SPRITE_CACHE
 
-class Plant(pygame.sprite.Sprite):
+class PlantBehavior:
     """
-    简化版向日射手：
-    - 固定在某一格子
-    - 每隔一段时间向右发射一颗子弹
-    - 有血量，被僵尸碰撞时会掉血
+    植物的行为：冷却、开火、受伤和死亡回调
+    子类提供 rect 以及 alive() / kill()（精灵组或 lite.EntityGroup 的成员关系）
     """
 
-    def __init__(self, pos):
+    __slots__ = ()
+    size = (50, 60)
+    # 不使用对象池时新建的子弹类型（模块末尾设置）
+    bullet_class = None
+
+    def _init_state(self, row, col):
         """
-        pos: 像素坐标 (x, y)，一般为格子中心位置
+        初始化逻辑状态（rect 已由子类按 pos 设置好）
         """
-        super().__init__()
-        # 创建带透明度的surface，确保正确渲染
-        self.image = pygame.Surface((50, 60), pygame.SRCALPHA)
-        self.image.fill(BLUE)
-        # 用一个小黑框表示"脸"
-        pygame.draw.rect(self.image, BLACK, (10, 15, 30, 30), 2)
-        # 画两个眼睛
-        pygame.draw.circle(self.image, (255, 255, 0), (20, 25), 4)
-        pygame.draw.circle(self.image, (255, 255, 0), (30, 25), 4)
-
-        self.rect = self.image.get_rect(center=pos)
+        self.row = row
+        self.col = col
+        # 死亡回调 on_death(plant)：被啃死或被铲除时调用一次，用于清理 plant_grid
+        self.on_death = None
 
         # 植物血量
         self.max_hp = PLANT_MAX_HP
@@ -64,19 +68,22 @@ class Plant(pygame.sprite.Sprite):
     def can_fire(self, current_time):
         """
         判断现在是否可以发射子弹
-        current_time: pygame.time.get_ticks() 获取的毫秒数
+        current_time: 模拟时钟的毫秒数（Simulation.time）
         """
         return current_time - self.last_fire_time >= PLANT_FIRE_INTERVAL
 
-    def fire(self, bullet_group):
+    def fire(self, bullet_group, current_time, pool=None):
         """
         发射一颗子弹
         bullet_group: 子弹精灵组，用于统一管理
+        current_time: 模拟时钟的毫秒数（Simulation.time）
+        pool: 子弹对象池（BulletPool），不传时直接新建子弹
         """
-        bullet = Bullet((self.rect.right, self.rect.centery))
+        pos = (self.rect.right, self.rect.centery)
+        bullet = pool.acquire(pos, self.row) if pool is not None else self.bullet_class(pos, self.row)
         bullet_group.add(bullet)
         # 记录这次开火时间
-        self.last_fire_time = pygame.time.get_ticks()
+        self.last_fire_time = current_time
 
     def take_damage(self, amount):
         """
@@ -86,34 +93,72 @@ class Plant(pygame.sprite.Sprite):
         if self.hp <= 0:
             self.kill()  # 从精灵组中删除，等同于"死亡"
 
-class Zombie(pygame.sprite.Sprite):
+    def kill(self):
+        """
+        从所有精灵组中移除，并通知 on_death 回调
+        """
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.on_death is not None:
+            self.on_death(self)
+
+class Plant(PlantBehavior, pygame.sprite.Sprite):
     """
-    简单僵尸：
-    - 从右往左缓慢移动
-    - 与植物碰撞时会啃植物（简化为持续扣植物血）
+    简化版向日射手：
+    - 固定在某一格子
+    - 每隔一段时间向右发射一颗子弹
+    - 有血量，被僵尸碰撞时会掉血
     """
 
-    def __init__(self, pos):
+    def __init__(self, pos, row=None, col=None):
         """
-        pos: 像素坐标 (x, y)，一般在屏幕右侧某行中心生成
+        pos: 像素坐标 (x, y)，一般为格子中心位置
+        row, col: 所在格子，用于按行查找僵尸和死亡时清理格子
         """
         super().__init__()
+        # 所有植物共用同一张预渲染图像
+        self.image = SPRITE_CACHE.get("plant", Plant.build_image)
+
+        self.rect = self.image.get_rect(center=pos)
+        self._init_state(row, col)
+
+    @staticmethod
+    def build_image():
+        """
+        绘制植物外观（只在缓存未命中时调用）
+        """
         # 创建带透明度的surface，确保正确渲染
-        self.image = pygame.Surface((60, 80), pygame.SRCALPHA)
-        self.image.fill(DARK_RED)
-        # 绘制僵尸的简单外观
-        pygame.draw.rect(self.image, BLACK, (15, 20, 30, 40), 2)
+        image = pygame.Surface(Plant.size, pygame.SRCALPHA)
+        image.fill(BLUE)
+        # 用一个小黑框表示"脸"
+        pygame.draw.rect(image, BLACK, (10, 15, 30, 30), 2)
         # 画两个眼睛
-        pygame.draw.circle(self.image, (255, 255, 255), (20, 30), 3)
-        pygame.draw.circle(self.image, (255, 255, 255), (40, 30), 3)
+        pygame.draw.circle(image, (255, 255, 0), (20, 25), 4)
+        pygame.draw.circle(image, (255, 255, 0), (30, 25), 4)
+        return image
 
-        self.rect = self.image.get_rect(center=pos)
+class ZombieBehavior:
+    """
+    僵尸的行为：移动、受伤以及僵尸群的合并与分离
+    子类提供 rect 以及 alive() / kill()
+    """
+
+    __slots__ = ()
+    size = (60, 80)
+
+    def _init_state(self, row):
+        """
+        初始化逻辑状态（rect 已由子类按 pos 设置好）
+        """
+        # 浮点横坐标（矩形左边），rect 由它取整得到，低速时也不会丢掉小数部分
+        self.x = float(self.rect.x)
+        self.row = row
         self.max_hp = ZOMBIE_MAX_HP
         self.hp = self.max_hp
         # ========== 僵尸移动速度设置区域 ==========
-        # 修改下面的 ZOMBIE_SPEED 值来调整僵尸移动速度
+        # 修改 settings.py 中的 ZOMBIE_SPEED 值来调整僵尸移动速度
         # 值越大，僵尸移动越快（建议范围：0.3 - 2.0）
-        self.speed = 1.0
+        self.speed = ZOMBIE_SPEED
         # ==========================================
         
         # 攻击相关（简单化：每帧只要碰上就扣一点血）
@@ -121,6 +166,13 @@ class Zombie(pygame.sprite.Sprite):
         self.attack_damage_per_frame = 0     # 根据 FPS 在外部计算或这里预设也行
         self.is_attacking = False  # 标记僵尸是否正在攻击植物
 
+        # 僵尸群（horde）：同一行、同一位置、同一状态的多只僵尸合并成一个实体
+        # count 为包含的僵尸数量，hp / max_hp 为全体成员合计（用于血量条）
+        self.count = 1
+        self.member_hps = None  # 各成员的血量基数（按加入顺序），单只僵尸时为 None
+        self.damage_taken = 0   # 整群共同受到的伤害：成员实际血量 = 基数 - damage_taken
+        self._weakest = 0       # 最小的血量基数，用于 O(1) 判断本次受伤是否有成员死亡
+
     def update(self, dt):
         """
         僵尸每帧向左移动
@@ -130,8 +182,9 @@ class Zombie(pygame.sprite.Sprite):
         # 只有当僵尸没有在攻击植物时，才继续移动
         # 如果需要在攻击时也移动，可以删除下面的 if 判断
         if not self.is_attacking:
-            # 水平向左移动（速度由 self.speed 控制，可在初始化时或主循环中修改）
-            self.rect.x -= self.speed
+            # 水平向左移动（速度由 self.speed 控制，单位是“像素/标准帧”，按 dt 折算）
+            self.x -= self.speed * dt / SIM_TICK_MS
+            self.rect.x = round(self.x)
         # ==================================
 
         # 记录本帧的伤害量（方便在主循环中对植物扣血）
@@ -144,40 +197,265 @@ class Zombie(pygame.sprite.Sprite):
     def take_damage(self, amount):
         """
         僵尸被子弹命中时掉血
+        子弹会命中所有与它重叠的僵尸，所以僵尸群的每个成员都受到 amount 点伤害
+        返回因此死亡的僵尸数量
         """
-        self.hp -= amount
-        if self.hp <= 0:
+        if self.member_hps is None:
+            self.hp -= amount
+            if self.hp <= 0:
+                self.kill()
+                return 1
+            return 0
+
+        self.damage_taken += amount
+        self.hp -= amount * self.count
+        if self._weakest - self.damage_taken > 0:
+            return 0
+        before = self.count
+        self._set_members([hp for hp in self.member_hp_list() if hp > 0])
+        return before - self.count
+
+    def member_hp_list(self):
+        """
+        返回各成员当前的血量（按加入顺序），单只僵尸返回 [hp]
+        """
+        if self.member_hps is None:
+            return [self.hp]
+        return [base - self.damage_taken for base in self.member_hps]
+
+    def _set_members(self, hps):
+        """
+        用成员血量列表 hps 重建僵尸群；只剩一只时恢复为普通僵尸，一只不剩时死亡
+        """
+        self.damage_taken = 0
+        self.count = len(hps)
+        self.max_hp = ZOMBIE_MAX_HP * max(self.count, 1)
+        if self.count > 1:
+            self.member_hps = hps
+            self._weakest = min(hps)
+            self.hp = sum(hps)
+            return
+        self.member_hps = None
+        self.hp = hps[0] if hps else 0
+        if not hps:
             self.kill()
 
-class Bullet(pygame.sprite.Sprite):
+    def absorb(self, other):
+        """
+        把同一位置、同一状态的另一只僵尸（或僵尸群）并入自己，other 随即从所有精灵组中移除
+        """
+        if self.member_hps is None:
+            self.member_hps = [self.hp]
+            self._weakest = self.hp
+        added = other.member_hp_list()
+        offset = self.damage_taken
+        self.member_hps.extend(hp + offset for hp in added)
+        self._weakest = min(self._weakest, min(added) + offset)
+        self.count = len(self.member_hps)
+        self.max_hp = ZOMBIE_MAX_HP * self.count
+        self.hp += sum(added)
+        other.kill()
+
+    def split(self, n):
+        """
+        从僵尸群中分出最后加入的 n 只僵尸，组成一个位于同一位置的新实体并返回
+        新实体不处于攻击状态（用于部分成员已经没有植物可啃的情况）
+        """
+        hps = self.member_hp_list()
+        self._set_members(hps[:-n])
+        other = type(self)(self.rect.center, self.row)
+        other.x = self.x
+        other.rect.x = self.rect.x
+        other.speed = self.speed
+        other.attack_damage_per_frame = self.attack_damage_per_frame
+        other._set_members(hps[-n:])
+        return other
+
+class Zombie(ZombieBehavior, pygame.sprite.Sprite):
+    """
+    简单僵尸：
+    - 从右往左缓慢移动
+    - 与植物碰撞时会啃植物（简化为持续扣植物血）
+    """
+
+    def __init__(self, pos, row=None):
+        """
+        pos: 像素坐标 (x, y)，一般在屏幕右侧某行中心生成
+        row: 生成时所在的行号，僵尸只会在这一行内移动
+        """
+        super().__init__()
+        # 所有僵尸共用同一张预渲染图像
+        self.image = SPRITE_CACHE.get("zombie", Zombie.build_image)
+
+        self.rect = self.image.get_rect(center=pos)
+        self._init_state(row)
+
+    @staticmethod
+    def build_image():
+        """
+        绘制僵尸外观（只在缓存未命中时调用）
+        """
+        # 创建带透明度的surface，确保正确渲染
+        image = pygame.Surface(Zombie.size, pygame.SRCALPHA)
+        image.fill(DARK_RED)
+        # 绘制僵尸的简单外观
+        pygame.draw.rect(image, BLACK, (15, 20, 30, 40), 2)
+        # 画两个眼睛
+        pygame.draw.circle(image, (255, 255, 255), (20, 30), 3)
+        pygame.draw.circle(image, (255, 255, 255), (40, 30), 3)
+        return image
+
+class BulletBehavior:
+    """
+    子弹的行为：飞行、出界销毁、对象池复用
+    子类提供 rect 以及 alive() / kill()
+    """
+
+    __slots__ = ()
+    size = (10, 10)
+    # 所属对象池，None 表示普通子弹，销毁后直接丢弃
+    pool = None
+    # 左边缘超过这个横坐标（世界坐标）时自动销毁；对象池会按草坪大小设置
+    max_x = SCREEN_WIDTH
+
+    def _init_state(self, row):
+        """
+        初始化逻辑状态（rect 已由子类按 pos 设置好）
+        """
+        self.x = float(self.rect.x)
+        self.row = row
+        self.speed = BULLET_SPEED
+        self.damage = BULLET_DAMAGE
+
+    def update(self, dt):
+        """
+        子弹每帧向右移动，位移按 dt 折算
+        """
+        self.x += self.speed * dt / SIM_TICK_MS
+        self.rect.x = round(self.x)
+
+        # 如果飞出草坪右侧，自动销毁，避免占用内存
+        if self.rect.left > self.max_x:
+            self.kill()
+
+    def reset(self, pos, row=None):
+        """
+        从对象池取出时重置状态，相当于重新构造
+        """
+        self.rect.center = pos
+        self.x = float(self.rect.x)
+        self.row = row
+        self.speed = BULLET_SPEED
+        self.damage = BULLET_DAMAGE
+
+    def kill(self):
+        """
+        从所有精灵组中移除；池化的子弹同时归还给对象池
+        """
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+class Bullet(BulletBehavior, pygame.sprite.Sprite):
     """
     子弹：
     - 从左往右直线飞行
     - 命中僵尸时造成伤害并销毁自己
+    - 如果来自对象池，销毁（kill）时自动归还给池
     """
 
-    def __init__(self, pos):
+    def __init__(self, pos, row=None):
         """
         pos: 像素坐标 (x, y)，一般是植物的右侧中心
+        row: 所在行号（与发射它的植物相同），子弹只会在这一行飞行
         """
         super().__init__()
+        # 所有子弹共用同一张预渲染图像
+        self.image = SPRITE_CACHE.get("bullet", Bullet.build_image)
+
+        self.rect = self.image.get_rect(center=pos)
+        self._init_state(row)
+
+    @staticmethod
+    def build_image():
+        """
+        绘制子弹外观（只在缓存未命中时调用）
+        """
         # 创建带透明度的surface，确保正确渲染
-        self.image = pygame.Surface((10, 10), pygame.SRCALPHA)
-        self.image.fill(YELLOW)
+        image = pygame.Surface(Bullet.size, pygame.SRCALPHA)
+        image.fill(YELLOW)
         # 画一个小圆点，更像子弹
-        pygame.draw.circle(self.image, (255, 200, 0), (5, 5), 5)
+        pygame.draw.circle(image, (255, 200, 0), (5, 5), 5)
+        return image
 
-        self.rect = self.image.get_rect(center=pos)
-        self.speed = BULLET_SPEED
-        self.damage = BULLET_DAMAGE
+Plant.bullet_class = Bullet
 
-    def update(self, dt):
+class BulletPool:
+    """
+    有上限的子弹对象池：
+    - acquire() 优先复用已回收的子弹，没有空闲时新建
+    - 池管理的子弹总数达到 capacity 后，额外需要的子弹照常新建但不再回收（记为溢出分配）
+    - 子弹 kill() 时自动调用 release() 归还
+    """
+
+    def __init__(self, capacity=BULLET_POOL_CAPACITY, max_x=None, bullet_class=None):
         """
-        子弹每帧向右移动
+        capacity: 池最多管理的子弹数量
+        max_x: 子弹飞过这个横坐标后销毁，不传时使用 Bullet.max_x（屏幕宽度）
+        bullet_class: 新建子弹的类型，默认 Bullet（lite.LiteBullet 用于无图像的模拟）
         """
-        self.rect.x += self.speed
+        self.capacity = capacity
+        self.max_x = max_x
+        self.bullet_class = bullet_class if bullet_class is not None else Bullet
+        self._free = []
+        self.pooled = 0     # 由池创建并负责回收的子弹总数
+        self.reused = 0     # 复用已回收子弹的次数
+        self.overflow = 0   # 池已满时额外分配的子弹数
 
-        # 如果飞出屏幕右侧，自动销毁，避免占用内存
-        if self.rect.left > SCREEN_WIDTH:
-            self.kill()
+    def acquire(self, pos, row=None):
+        """
+        取出一颗位于 pos、第 row 行的子弹
+        """
+        if self._free:
+            bullet = self._free.pop()
+            bullet.reset(pos, row)
+            self.reused += 1
+        elif self.pooled < self.capacity:
+            bullet = self.bullet_class(pos, row)
+            bullet.pool = self
+            self.pooled += 1
+        else:
+            bullet = self.bullet_class(pos, row)
+            self.overflow += 1
+        if self.max_x is not None:
+            bullet.max_x = self.max_x
+        return bullet
 
+    def release(self, bullet):
+        """
+        归还一颗已经离开所有精灵组的子弹
+        """
+        self._free.append(bullet)
+
+    def stats(self):
+        """
+        返回对象池统计：容量、已创建、空闲、复用次数、复用率、溢出分配
+        """
+        acquired = self.pooled + self.reused + self.overflow
+        return {
+            "capacity": self.capacity,
+            "pooled": self.pooled,
+            "free": len(self._free),
+            "reused": self.reused,
+            "reuse_rate": self.reused / acquired if acquired else 0.0,
+            "overflow": self.overflow,
+        }
+
+
+def preload_images():
+    """
+    启动时预先生成植物、僵尸、子弹的图像（窗口已创建时顺便转换像素格式），第一帧不再临时绘制
+    """
+    for key, entity_class in (("plant", Plant), ("zombie", Zombie), ("bullet", Bullet)):
+        SPRITE_CACHE.get(key, entity_class.build_image)
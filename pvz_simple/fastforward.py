@@ -0,0 +1,224 @@
+"""
+事件驱动的快进（只用于无界面运行）：
+- 大多数帧里什么“事件”都没有发生：僵尸匀速前进或原地啃食，子弹匀速飞行
+- fast_forward(sim, ticks) 先算出接下来多少帧内一定不会发生事件
+  （刷怪、植物开火、子弹命中或飞出草坪、僵尸碰到植物、植物被啃死、突破防线），
+  把这些帧一次性推进（位置直接按帧数折算），再用 sim.step() 正常计算发生事件的那一帧
+- 事件帧仍然走原来的规则，预测只需要“宁早勿晚”，因此结果与逐帧 sim.run(ticks) 相同
+
+模拟时钟和植物血量按与 step() 相同的顺序逐帧累加，浮点结果一致；
+位置在每帧位移为整数像素（默认速度）时用一次乘法推进，否则逐帧累加。
+支持 sprite 和 lite 后端（numpy 后端本身已经是批量运算）。
+
+命令行用法：
+    python fastforward.py                             # 默认布局，对比逐帧推进和快进
+    python fastforward.py --layout front1 --seconds 1200 --seed 3
+"""
+
+import math
+import time
+from bisect import bisect_left
+
+from settings import (
+    SIM_TICK_MS,
+    ZOMBIE_SPAWN_INTERVAL,
+    DROP_MISSED_BULLETS,
+)
+from simulation import Simulation
+
+# rect 由浮点坐标四舍五入得到，判断“这几帧内一定碰不到”时留出的余量（像素）
+ROUNDING_MARGIN = 1
+
+def _safe_ticks(gap, closing):
+    """
+    距离 gap（像素）每帧缩小 closing 像素，返回接下来能保证距离仍大于 ROUNDING_MARGIN 的帧数
+    """
+    if gap <= ROUNDING_MARGIN:
+        return 0
+    if closing <= 0:
+        return math.inf
+    return math.ceil((gap - ROUNDING_MARGIN) / closing) - 1
+
+def _advance(x, delta, ticks):
+    """
+    坐标 x 每帧加 delta，推进 ticks 帧
+    """
+    if float(delta).is_integer():
+        return x + delta * ticks  # 整数步长：一次乘法与逐帧累加的结果完全相同
+    for _ in range(ticks):
+        x += delta
+    return x
+
+def _quiet_ticks(sim, limit):
+    """
+    计算接下来最多 limit 帧中，从下一帧开始连续多少帧一定不会发生事件
+    返回 (帧数, 啃食表)，啃食表为 {植物: [每帧依次受到的伤害, ...]}，供 _skip() 使用
+    先算位置相关的事件，得到的上限越小，后面逐帧累加的时钟和血量就越短
+    """
+    dt = SIM_TICK_MS
+    quiet = limit
+    grid = sim.grid
+    lane_plants = [[] for _ in range(grid.rows)]
+    for plant in sim.plants:
+        lane_plants[plant.row].append((plant.rect.left, plant.rect.right))
+    lane_bullets = [[] for _ in range(grid.rows)]
+    for bullet in sim.bullets:
+        # 飞出草坪右侧
+        quiet = min(quiet, _safe_ticks(bullet.max_x - bullet.x, bullet.speed * dt / SIM_TICK_MS))
+        lane_bullets[bullet.row].append(bullet)
+    if not quiet:
+        return 0, None
+    for lane in lane_plants:
+        lane.sort()
+    bullet_lanes = []
+    for lane in lane_bullets:
+        lane.sort(key=lambda bullet: bullet.x)
+        bullet_lanes.append((
+            [bullet.x for bullet in lane],
+            max((bullet.speed * dt / SIM_TICK_MS for bullet in lane), default=0.0),
+            lane[0].rect.width if lane else 0,
+        ))
+
+    bites = {}
+    for zombie in sim.zombies:
+        rect = zombie.rect
+        if zombie.is_attacking:
+            # 原地啃食：记录每帧对目标植物的伤害；目标已经不在时，下一帧会重新起步
+            target = next(sim._plants_in_contact(zombie), None)
+            if target is None:
+                return 0, None
+            amount = zombie.attack_damage_per_second * (dt / 1000.0)
+            bites.setdefault(target, []).extend([amount] * zombie.count)
+            step = 0.0
+        else:
+            step = zombie.speed * dt / SIM_TICK_MS
+            # 突破防线
+            quiet = min(quiet, _safe_ticks(zombie.x, step))
+            # 碰到左边最近的植物
+            plants = lane_plants[zombie.row]
+            index = bisect_left(plants, (rect.right,)) - 1
+            if index >= 0:
+                quiet = min(quiet, _safe_ticks(zombie.x - plants[index][1], step))
+
+        # 子弹命中：还没飞过这只僵尸的子弹里最靠前的那颗最先到达
+        xs, bullet_step, bullet_width = bullet_lanes[zombie.row]
+        index = bisect_left(xs, zombie.x + rect.width + ROUNDING_MARGIN) - 1
+        if index >= 0:
+            gap = zombie.x - (xs[index] + bullet_width)
+            quiet = min(quiet, _safe_ticks(gap, bullet_step + step))
+        if not quiet:
+            return 0, None
+
+    if DROP_MISSED_BULLETS:
+        # 前方没有僵尸的子弹会在下一帧被销毁
+        for row, (xs, _, _) in enumerate(bullet_lanes):
+            if xs and not any(z.x + z.rect.width > xs[-1] for z in sim.lane_zombies[row]):
+                return 0, None
+
+    # 刷怪：模拟时钟按与 step() 相同的方式累加，顺便得到之后每一帧的时钟值
+    times = []
+    clock = sim.time
+    for _ in range(quiet):
+        clock += dt
+        if clock - sim.last_zombie_spawn_time >= ZOMBIE_SPAWN_INTERVAL:
+            break
+        times.append(clock)
+    quiet = len(times)
+    if not quiet:
+        return 0, None
+
+    # 植物开火：本行有僵尸时，第一次满足冷却条件的帧（条件随时间单调，可以二分）
+    for plant in sim.plants:
+        if sim.lane_zombies[plant.row]:
+            quiet = bisect_left(times, True, 0, quiet, key=plant.can_fire)
+            if not quiet:
+                return 0, None
+
+    # 植物被啃死：按 step() 的顺序逐帧扣血，找到第一次降到 0 以下的帧
+    for plant, amounts in bites.items():
+        hp = plant.hp
+        for tick in range(quiet):
+            for amount in amounts:
+                hp -= amount
+            if hp <= 0:
+                quiet = tick
+                break
+    return quiet, bites
+
+def _skip(sim, ticks, bites):
+    """
+    一次推进 ticks 个没有事件的帧：时钟、位置、啃食伤害与逐帧 step() 完全相同
+    """
+    dt = SIM_TICK_MS
+    for _ in range(ticks):
+        sim.time += dt
+    sim.tick_count += ticks
+    for zombie in sim.zombies:
+        zombie.attack_damage_per_frame = zombie.attack_damage_per_second * (dt / 1000.0)
+        if not zombie.is_attacking:
+            zombie.x = _advance(zombie.x, -(zombie.speed * dt / SIM_TICK_MS), ticks)
+            zombie.rect.x = round(zombie.x)
+    for bullet in sim.bullets:
+        bullet.x = _advance(bullet.x, bullet.speed * dt / SIM_TICK_MS, ticks)
+        bullet.rect.x = round(bullet.x)
+    for plant, amounts in bites.items():
+        hp = plant.hp
+        for _ in range(ticks):
+            for amount in amounts:
+                hp -= amount
+        plant.hp = hp
+
+def fast_forward(sim, ticks):
+    """
+    与 sim.run(ticks) 结果相同的快进：没有事件的帧一次性跳过，只逐帧计算发生事件的帧
+    sim: sprite 或 lite 后端的 Simulation，时间步长固定为 SIM_TICK_MS
+    返回 (推进的帧数, 其中实际调用 step() 的帧数)
+    """
+    if not isinstance(sim, Simulation):
+        raise TypeError(f"快进只支持 sprite / lite 后端，不支持 {sim.backend}")
+    done = stepped = 0
+    while done < ticks and not sim.game_over:
+        quiet, bites = _quiet_ticks(sim, ticks - done)
+        if quiet:
+            _skip(sim, quiet, bites)
+            done += quiet
+        if done < ticks:
+            sim.step()
+            done += 1
+            stepped += 1
+    return done, stepped
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from simulation import create_simulation
+    from sweep import LAYOUTS, parse_layout
+
+    parser = argparse.ArgumentParser(description="对比逐帧推进和事件驱动快进")
+    parser.add_argument("--layout", default="front3", help=f"种植布局：{'/'.join(LAYOUTS)} 或 row:col,row:col")
+    parser.add_argument("--seconds", type=float, default=600, help="最长游戏时间（秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", default="lite", choices=["sprite", "lite"])
+    args = parser.parse_args()
+
+    ticks = int(args.seconds * 1000 / SIM_TICK_MS)
+    results = []
+    for mode in ("逐帧", "快进"):
+        sim = create_simulation(backend=args.backend, seed=args.seed)
+        for row, col in parse_layout(args.layout):
+            sim.add_plant(row, col)
+        start = time.perf_counter()
+        if mode == "逐帧":
+            advanced, stepped = sim.run(ticks), None
+        else:
+            advanced, stepped = fast_forward(sim, ticks)
+        elapsed = time.perf_counter() - start
+        outcome = (sim.tick_count, sim.breach_tick, sim.kills, sim.entity_counts())
+        results.append(outcome)
+        detail = f"，其中逐帧计算 {stepped} 帧" if stepped is not None else ""
+        print(
+            f"{mode}：推进 {advanced} 帧{detail}，耗时 {elapsed * 1000:.0f} ms；"
+            f"突破帧号 {sim.breach_tick}，击杀 {sim.kills}"
+        )
+    print(f"结果一致: {results[0] == results[1]}")
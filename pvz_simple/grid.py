@@ -1,10 +1,17 @@
 # grid.py
 """
 处理草坪网格的绘制和坐标转换
+
+草坪大小可以在运行时指定（例如 20×200 格的压力测试草坪），
+因此不再为每个格子预先生成 Rect，格子的位置都按行列号现算。
+坐标统一使用“世界坐标”：默认大小的草坪与屏幕坐标完全重合，
+更大的草坪通过 camera.Camera 滚动显示其中一部分。
 """
 
 import pygame
 from settings import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
     GRID_ROWS,
     GRID_COLS,
     CELL_SIZE,
@@ -15,57 +22,124 @@ from settings import (
     BLACK,
 )
 
+# 默认草坪右侧和下方到屏幕边缘的空地（僵尸从右侧空地出现），更大的草坪保留同样的边距
+LAWN_MARGIN_RIGHT = SCREEN_WIDTH - GRID_OFFSET_X - GRID_COLS * CELL_SIZE
+LAWN_MARGIN_BOTTOM = SCREEN_HEIGHT - GRID_OFFSET_Y - GRID_ROWS * CELL_SIZE
+
 class Grid:
-    def __init__(self):
-        # 预先计算出每个格子的 rect，用于绘制和点击检测
-        self.cells = []
-        for row in range(GRID_ROWS):
-            row_cells = []
-            for col in range(GRID_COLS):
-                x = GRID_OFFSET_X + col * CELL_SIZE
-                y = GRID_OFFSET_Y + row * CELL_SIZE
-                rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                row_cells.append(rect)
-            self.cells.append(row_cells)
-
-    def draw(self, surface):
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS, cell_size=CELL_SIZE):
         """
-        在给定的 surface（一般是屏幕）上绘制网格
+        rows / cols: 草坪行数和列数
+        cell_size: 每个格子的像素大小
         """
-        for row in range(GRID_ROWS):
-            for col in range(GRID_COLS):
-                rect = self.cells[row][col]
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.offset_x = GRID_OFFSET_X
+        self.offset_y = GRID_OFFSET_Y
+
+        # 整片草坪的矩形（世界坐标），用于点击检测和可见范围裁剪
+        self.lawn_rect = pygame.Rect(self.offset_x, self.offset_y, cols * cell_size, rows * cell_size)
+        # 世界大小：草坪加上四周的空地
+        self.world_width = self.lawn_rect.right + LAWN_MARGIN_RIGHT
+        self.world_height = self.lawn_rect.bottom + LAWN_MARGIN_BOTTOM
+
+        # 预渲染的棋盘格图案，按需要的大小生成（只覆盖一屏多一点，而不是整片草坪）
+        self._pattern = None
+
+    def _build_pattern(self, rows, cols):
+        """
+        画一块 rows × cols 格的棋盘格图案（棋盘格 + 边框）
+        棋盘格每两格重复一次，所以只要起点对齐到偶数行列，这块图案就能拼出草坪的任意部分
+        """
+        size = self.cell_size
+        surface = pygame.Surface((cols * size, rows * size))
+        for row in range(rows):
+            for col in range(cols):
+                rect = pygame.Rect(col * size, row * size, size, size)
                 # 使用两种绿色，形成棋盘格效果
                 color = GREEN if (row + col) % 2 == 0 else DARK_GREEN
                 pygame.draw.rect(surface, color, rect)
                 # 画格子边框
                 pygame.draw.rect(surface, BLACK, rect, 1)
+        return surface
+
+    def draw(self, surface, view=None):
+        """
+        在给定的 surface（一般是屏幕）上绘制网格中可见的部分
+        view: 当前可见区域的世界坐标矩形（摄像机），不传时世界坐标即 surface 坐标
+        """
+        if view is None:
+            view = surface.get_rect()
+        visible = self.lawn_rect.clip(view)
+        if visible.width == 0 or visible.height == 0:
+            return
+
+        size = self.cell_size
+        # 可见区域覆盖的行列范围，起点对齐到偶数行列
+        first_col = (visible.left - self.offset_x) // size
+        first_row = (visible.top - self.offset_y) // size
+        first_col -= first_col % 2
+        first_row -= first_row % 2
+        last_col = (visible.right - 1 - self.offset_x) // size
+        last_row = (visible.bottom - 1 - self.offset_y) // size
+        cols = last_col - first_col + 1
+        rows = last_row - first_row + 1
+
+        pattern = self._pattern
+        if pattern is None or pattern.get_width() < cols * size or pattern.get_height() < rows * size:
+            if pattern is not None:
+                rows = max(rows, pattern.get_height() // size)
+                cols = max(cols, pattern.get_width() // size)
+            # 图案尺寸取偶数格，保证棋盘格在图案内外衔接
+            pattern = self._pattern = self._build_pattern(rows + rows % 2, cols + cols % 2)
+
+        origin_x = self.offset_x + first_col * size
+        origin_y = self.offset_y + first_row * size
+        surface.blit(
+            pattern,
+            (visible.x - view.x, visible.y - view.y),
+            visible.move(-origin_x, -origin_y),
+        )
 
     def get_cell_indices_from_pos(self, pos):
         """
-        根据鼠标点击的像素坐标，返回所在的格子索引 (row, col)
+        根据鼠标点击的像素坐标（世界坐标），返回所在的格子索引 (row, col)
         如果不在网格范围内，返回 None
         """
         x, y = pos
         # 判断是否在整个网格的框中
-        grid_rect = pygame.Rect(
-            GRID_OFFSET_X,
-            GRID_OFFSET_Y,
-            GRID_COLS * CELL_SIZE,
-            GRID_ROWS * CELL_SIZE,
-        )
-        if not grid_rect.collidepoint(x, y):
+        if not self.lawn_rect.collidepoint(x, y):
             return None
 
-        col = (x - GRID_OFFSET_X) // CELL_SIZE
-        row = (y - GRID_OFFSET_Y) // CELL_SIZE
+        col = (x - self.offset_x) // self.cell_size
+        row = (y - self.offset_y) // self.cell_size
         return int(row), int(col)
 
+    def col_range(self, left, right):
+        """
+        横坐标区间 [left, right)（世界坐标）覆盖的格子列号，返回 range，草坪以外的部分不算
+        用于按格子查找与某个矩形重叠的植物
+        """
+        size = self.cell_size
+        first = max((left - self.offset_x) // size, 0)
+        last = min((right - 1 - self.offset_x) // size, self.cols - 1)
+        return range(first, last + 1)
+
     def get_cell_center(self, row, col):
         """
         根据格子索引 (row, col)，返回该格子中心点像素坐标
         用于放置植物、子弹生成位置等
         """
-        rect = self.cells[row][col]
-        return rect.center
+        size = self.cell_size
+        return (self.offset_x + col * size + size // 2, self.offset_y + row * size + size // 2)
 
+def parse_lawn_size(text):
+    """
+    命令行参数 "ROWSxCOLS"（例如 "20x200"）-> (rows, cols)
+    """
+    rows, _, cols = text.lower().partition("x")
+    rows, cols = int(rows), int(cols)
+    if rows <= 0 or cols <= 0:
+        raise ValueError(f"草坪大小必须为正数：{text}")
+    return rows, cols
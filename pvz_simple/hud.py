@@ -0,0 +1,205 @@
+"""
+界面层（HUD）：提示文字、铲子图标、暂停 / 退出按钮、暂停遮罩
+
+这些内容几乎每帧都一样，所以全部只生成一次：
+- 文字按 (字符串, 颜色) 缓存渲染结果，超过上限时淘汰最久未用的（LRU）
+- 铲子图标（不透明 / 半透明两份）和暂停遮罩在创建 Hud 时画好
+- 退出确认框画在游戏画面里（不弹出系统对话框），打开期间主循环照常处理事件和绘制
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from settings import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    HUD_TEXT_CACHE_SIZE,
+    BLACK,
+)
+
+def create_shovel_icon():
+    """
+    创建铲子图标
+    返回一个 Surface 对象
+    """
+    icon_size = 50
+    icon = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
+
+    # 绘制铲子（简单的几何图形）
+    # 铲子把手（比棕框稍淡的棕色）
+    pygame.draw.rect(icon, (174, 104, 54), (20, 5, 8, 25))
+    # 铲子头部（灰色金属）
+    pygame.draw.ellipse(icon, (128, 128, 128), (10, 25, 30, 20))
+    # 铲子边缘高光
+    pygame.draw.ellipse(icon, (180, 180, 180), (12, 27, 26, 16), 2)
+
+    return icon
+
+class TextCache:
+    """
+    文字渲染缓存：同样的 (字符串, 颜色) 只调用一次 font.render
+    """
+
+    def __init__(self, font, max_entries=HUD_TEXT_CACHE_SIZE):
+        """
+        font: 用于渲染的字体
+        max_entries: 最多缓存的文字数量，超出后淘汰最久未使用的
+        """
+        self.font = font
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color):
+        """
+        返回渲染好的文字 surface（抗锯齿）
+        """
+        key = (text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+class Hud:
+    """
+    负责界面元素的布局和绘制，按钮区域也供 main() 做点击检测
+    """
+
+    def __init__(self, font):
+        """
+        font: 界面文字使用的字体
+        """
+        self.text = TextCache(font)
+
+        # ========== 铲子 ==========
+        # 不透明图标（未选中时）和半透明图标（选中时），都只画一次
+        self.shovel_icon = create_shovel_icon()
+        self.shovel_icon_faded = self.shovel_icon.copy()
+        self.shovel_icon_faded.set_alpha(128)
+        # 铲子下层棕色框（用于取消选中）- 固定在右上角，不随鼠标移动
+        self.shovel_bg_rect = pygame.Rect(SCREEN_WIDTH - 60, 10, 50, 50)
+        self.shovel_bg_color = (139, 69, 19)  # 棕色
+        # 右上角固定位置的铲子图标（选中时显示半透明）
+        self.fixed_shovel_rect = pygame.Rect(SCREEN_WIDTH - 60, 10, 50, 50)
+
+        # ========== 游戏控制按钮 ==========
+        self.pause_button_rect = pygame.Rect(SCREEN_WIDTH - 180, SCREEN_HEIGHT - 50, 80, 40)  # 暂停按钮（右下角）
+        self.quit_button_rect = pygame.Rect(SCREEN_WIDTH - 90, SCREEN_HEIGHT - 50, 80, 40)  # 退出按钮（右下角）
+
+        # ========== 暂停遮罩 ==========
+        self.pause_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.pause_overlay.fill((0, 0, 0))
+        self.pause_overlay.set_alpha(128)
+
+        # ========== 退出确认框 ==========
+        self.confirm_rect = pygame.Rect(0, 0, 320, 150)
+        self.confirm_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.confirm_yes_rect = pygame.Rect(0, 0, 100, 40)
+        self.confirm_yes_rect.midbottom = (self.confirm_rect.centerx - 70, self.confirm_rect.bottom - 20)
+        self.confirm_no_rect = pygame.Rect(0, 0, 100, 40)
+        self.confirm_no_rect.midbottom = (self.confirm_rect.centerx + 70, self.confirm_rect.bottom - 20)
+
+    def confirm_choice(self, event):
+        """
+        退出确认框打开时解析一个事件
+        返回 True 表示确认退出（Y / 回车 / 点击“确定”），False 表示取消（N / Esc / 点击“取消”），
+        其他事件返回 None
+        """
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_y, pygame.K_RETURN, pygame.K_KP_ENTER):
+                return True
+            if event.key in (pygame.K_n, pygame.K_ESCAPE):
+                return False
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.confirm_yes_rect.collidepoint(event.pos):
+                return True
+            if self.confirm_no_rect.collidepoint(event.pos):
+                return False
+        return None
+
+    def draw(self, renderer, shovel_selected, game_paused, game_over, mouse_pos, time_scale=1, detail=True,
+             confirming_quit=False):
+        """
+        绘制全部界面元素
+        renderer: render.Renderer，记录绘制区域
+        time_scale: 当前游戏速度倍率，非 1 倍速时在按钮左侧显示
+        detail: 为 False 时省略提示文字（负载过高时的降级绘制）
+        confirming_quit: 为 True 时在最上层显示退出确认框
+        """
+        # 3.3 显示简单文字信息
+        if detail:
+            renderer.blit(
+                self.text.render("左键点击格子种植植物  |  僵尸到达左侧则游戏结束", BLACK),
+                (50, 10),
+            )
+
+        # 3.4 绘制铲子图标
+        # 棕色背景框始终固定在右上角（最底层）
+        renderer.draw_rect(self.shovel_bg_color, self.shovel_bg_rect)
+        renderer.draw_rect(BLACK, self.shovel_bg_rect, 2)  # 边框
+
+        if shovel_selected:
+            # 跟随鼠标的铲子图标（半透明）
+            renderer.blit(self.shovel_icon_faded, self.shovel_icon_faded.get_rect(center=mouse_pos))
+            # 右上角显示固定的半透明铲子图标
+            renderer.blit(self.shovel_icon_faded, self.fixed_shovel_rect)
+        else:
+            # 如果未选中，固定在右上角（完全不透明）
+            renderer.blit(self.shovel_icon, self.fixed_shovel_rect)
+
+        # 3.5 绘制游戏控制按钮
+        # 绘制暂停按钮
+        pause_color = (100, 150, 200) if not game_paused else (200, 150, 100)
+        renderer.draw_rect(pause_color, self.pause_button_rect)
+        renderer.draw_rect(BLACK, self.pause_button_rect, 2)
+        pause_text = self.text.render("暂停" if not game_paused else "继续", BLACK)
+        renderer.blit(pause_text, pause_text.get_rect(center=self.pause_button_rect.center))
+
+        # 绘制退出按钮
+        renderer.draw_rect((200, 100, 100), self.quit_button_rect)
+        renderer.draw_rect(BLACK, self.quit_button_rect, 2)
+        quit_text = self.text.render("退出", BLACK)
+        renderer.blit(quit_text, quit_text.get_rect(center=self.quit_button_rect.center))
+
+        # 显示快进倍率
+        if time_scale != 1:
+            speed_text = self.text.render(f"速度 {time_scale}x", (200, 0, 0))
+            renderer.blit(speed_text, speed_text.get_rect(midright=(self.pause_button_rect.left - 10, self.pause_button_rect.centery)))
+
+        # 3.6 显示暂停提示
+        if game_paused:
+            pause_surface = self.text.render("游戏已暂停 - 按空格键继续", (255, 0, 0))
+            # 绘制半透明背景
+            renderer.blit(self.pause_overlay, (0, 0))
+            renderer.blit(pause_surface, pause_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+
+        if game_over:
+            over_surface = self.text.render("游戏结束！关掉窗口退出。", (255, 0, 0))
+            renderer.blit(over_surface, (SCREEN_WIDTH // 2 - 100, 10))
+
+        # 3.7 退出确认框（暂停时遮罩已经画过，不再叠加）
+        if confirming_quit:
+            if not game_paused:
+                renderer.blit(self.pause_overlay, (0, 0))
+            renderer.draw_rect((240, 230, 200), self.confirm_rect)
+            renderer.draw_rect(BLACK, self.confirm_rect, 2)
+            question = self.text.render("确定要退出游戏吗？", BLACK)
+            renderer.blit(question, question.get_rect(midtop=(self.confirm_rect.centerx, self.confirm_rect.top + 25)))
+            for rect, label, color in (
+                (self.confirm_yes_rect, "确定", (200, 100, 100)),
+                (self.confirm_no_rect, "取消", (100, 150, 200)),
+            ):
+                renderer.draw_rect(color, rect)
+                renderer.draw_rect(BLACK, rect, 2)
+                text = self.text.render(label, BLACK)
+                renderer.blit(text, text.get_rect(center=rect.center))
@@ -0,0 +1,213 @@
+"""
+轻量实体（只用于无界面运行）：
+- LitePlant / LiteZombie / LiteBullet 使用 __slots__，没有 __dict__、图像和精灵组字典，
+  行为直接继承 entities 中的 PlantBehavior / ZombieBehavior / BulletBehavior，与精灵版完全相同
+- EntityGroup 是只实现了 Simulation 用到的那部分接口的极简分组
+- LiteSimulation 是换用这些类型的 Simulation（后端名 "lite"），每一帧的结果与 sprite 后端相同，
+  适合批量跑局（sweep.py、benchmark.py --no-render），同一个进程里能同时容纳更多对局
+- entity_memory_report() 用 tracemalloc 统计各后端每个存活实体占用的字节数
+
+命令行用法：
+    python lite.py               # 打印三种后端每个实体的内存占用
+    python lite.py 50000         # 指定每种实体的样本数量
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import pygame
+
+from grid import Grid
+from entities import PlantBehavior, ZombieBehavior, BulletBehavior, Plant, Zombie, Bullet
+from assets import SPRITE_CACHE
+from simulation import Simulation, create_simulation
+
+# 内存统计时每种实体的样本数量
+ENTITY_MEMORY_SAMPLE = 20000
+
+class EntityGroup:
+    """
+    极简实体组：成员按加入顺序保存在 dict 的键中
+    接口与 pygame.sprite.Group 中 Simulation 用到的部分相同（add / remove / 遍历 / len / update）
+    """
+
+    __slots__ = ("_members",)
+
+    def __init__(self):
+        self._members = {}
+
+    def add(self, *entities):
+        for entity in entities:
+            if entity not in self._members:
+                self._members[entity] = None
+                entity._groups += (self,)
+
+    def remove(self, *entities):
+        for entity in entities:
+            if entity in self._members:
+                del self._members[entity]
+                entity._groups = tuple(group for group in entity._groups if group is not self)
+
+    def has(self, entity):
+        return entity in self._members
+
+    def sprites(self):
+        return list(self._members)
+
+    def update(self, *args):
+        for entity in list(self._members):
+            entity.update(*args)
+
+    def __iter__(self):
+        # 与 pygame.sprite.Group 一样遍历副本，遍历中可以增删成员
+        return iter(list(self._members))
+
+    def __contains__(self, entity):
+        return entity in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+class LiteEntity:
+    """
+    轻量实体的分组成员关系：_groups 记录所在的 EntityGroup（元组，通常只有一两个）
+    """
+
+    __slots__ = ("_groups",)
+
+    def __init__(self):
+        self._groups = ()
+
+    def alive(self):
+        return bool(self._groups)
+
+    def groups(self):
+        return list(self._groups)
+
+    def kill(self):
+        """
+        从所有分组中移除
+        """
+        for group in self._groups:
+            del group._members[self]
+        self._groups = ()
+
+def _rect_at(size, pos):
+    rect = pygame.Rect((0, 0), size)
+    rect.center = pos
+    return rect
+
+class LitePlant(PlantBehavior, LiteEntity):
+    __slots__ = ("rect", "row", "col", "on_death", "max_hp", "hp", "last_fire_time")
+
+    def __init__(self, pos, row=None, col=None):
+        super().__init__()
+        self.rect = _rect_at(self.size, pos)
+        self._init_state(row, col)
+
+class LiteZombie(ZombieBehavior, LiteEntity):
+    __slots__ = (
+        "rect", "x", "row", "max_hp", "hp", "speed",
+        "attack_damage_per_second", "attack_damage_per_frame", "is_attacking",
+        "count", "member_hps", "damage_taken", "_weakest",
+    )
+
+    def __init__(self, pos, row=None):
+        super().__init__()
+        self.rect = _rect_at(self.size, pos)
+        self._init_state(row)
+
+class LiteBullet(BulletBehavior, LiteEntity):
+    __slots__ = ("rect", "x", "row", "speed", "damage", "pool", "max_x")
+
+    def __init__(self, pos, row=None):
+        super().__init__()
+        self.rect = _rect_at(self.size, pos)
+        # 槽位会遮住 BulletBehavior 上的类属性默认值，这里显式初始化
+        self.pool = None
+        self.max_x = BulletBehavior.max_x
+        self._init_state(row)
+
+LitePlant.bullet_class = LiteBullet
+
+class LiteSimulation(Simulation):
+    """
+    使用轻量实体的 Simulation：规则、随机数和处理顺序完全相同，只是实体没有图像，不能直接绘制
+    """
+
+    backend = "lite"
+    plant_class = LitePlant
+    zombie_class = LiteZombie
+    bullet_class = LiteBullet
+    group_class = EntityGroup
+
+def _sample_entities(kind, count, rows):
+    """
+    生成 count 个 kind 实体的 export_entities() 格式数据（僵尸位置各不相同，不会合并成僵尸群）
+    """
+    entities = {
+        "plants": {"row": [], "col": [], "hp": [], "last_fire": []},
+        "zombies": {"row": [], "x": [], "hp": [], "speed": [], "attacking": []},
+        "bullets": {"row": [], "x": [], "speed": [], "damage": []},
+    }
+    index = range(count)
+    if kind == "plants":
+        entities[kind] = {
+            "row": [i % rows for i in index], "col": [i // rows for i in index],
+            "hp": [100.0] * count, "last_fire": [0.0] * count,
+        }
+    elif kind == "zombies":
+        entities[kind] = {
+            "row": [i % rows for i in index], "x": [float(i) for i in index],
+            "hp": [150.0] * count, "speed": [1.0] * count, "attacking": [False] * count,
+        }
+    else:
+        entities[kind] = {
+            "row": [i % rows for i in index], "x": [float(i) for i in index],
+            "speed": [5.0] * count, "damage": [25.0] * count,
+        }
+    return entities
+
+def entity_memory_report(count=ENTITY_MEMORY_SAMPLE, backends=("sprite", "lite", "numpy")):
+    """
+    用 tracemalloc 测量各后端每个存活实体平均占用的字节数
+    实体通过 import_entities() 按游戏中的方式加入各自的分组（精灵组、按行分组、数组……）
+    返回 {后端: {"plants": 字节, "zombies": 字节, "bullets": 字节}}
+    """
+    # 共享图像只生成一次，不计入实体
+    SPRITE_CACHE.get("plant", Plant.build_image)
+    SPRITE_CACHE.get("zombie", Zombie.build_image)
+    SPRITE_CACHE.get("bullet", Bullet.build_image)
+
+    rows = 20
+    grid = Grid(rows, count // rows + 1)
+    report = {}
+    tracemalloc.start()
+    try:
+        for backend in backends:
+            report[backend] = {}
+            for kind in ("plants", "zombies", "bullets"):
+                sim = create_simulation(grid, backend=backend)
+                if sim.backend != backend:
+                    report.pop(backend)
+                    break
+                entities = _sample_entities(kind, count, rows)
+                gc.collect()
+                before = tracemalloc.get_traced_memory()[0]
+                sim.import_entities(entities)
+                gc.collect()
+                report[backend][kind] = (tracemalloc.get_traced_memory()[0] - before) / count
+                del sim, entities
+    finally:
+        tracemalloc.stop()
+    return report
+
+
+if __name__ == "__main__":
+    sample = int(sys.argv[1]) if len(sys.argv) > 1 else ENTITY_MEMORY_SAMPLE
+    report = entity_memory_report(sample)
+    print(f"每个存活实体的内存占用（字节，样本 {sample} 个，tracemalloc）")
+    print(f"{'后端':<8s}{'植物':>10s}{'僵尸':>10s}{'子弹':>10s}")
+    for backend, sizes in report.items():
+        print(f"{backend:<10s}{sizes['plants']:>10.0f}{sizes['zombies']:>10.0f}{sizes['bullets']:>10.0f}")
@@ -10,6 +10,11 @@
 6. 血量系统 + 简单的"突破防线则游戏结束"
 """
 
+import time
+
+# 启动计时起点（--startup-profile），放在其他导入之前
+STARTUP_T0 = time.perf_counter()
+
 import sys
 import random
 import pygame
@@ -18,139 +23,123 @@ from settings import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
     FPS,
+    TIME_SCALES,
     GRID_ROWS,
     GRID_COLS,
-    ZOMBIE_SPAWN_INTERVAL,
-    WHITE,
-    BLACK,
+    CAMERA_SCROLL_SPEED,
+    SIM_BACKEND,
+    FONT_SIZE,
+)
+from grid import Grid, parse_lawn_size
+from simulation import create_simulation
+from entities import preload_images
+from assets import load_font
+from render import Renderer
+from hud import Hud
+from replay import ReplayRecorder
+from savestate import Autosaver, load_snapshot
+from worker import RemoteSimulation
+from pacing import FramePacer, RENDER_FULL, RENDER_SKIP
+from profiler import (
+    FrameProfiler,
+    StartupProfile,
+    PHASE_EVENTS,
+    PHASE_BACKGROUND,
+    PHASE_ENTITIES,
+    PHASE_HUD,
+    PHASE_FLIP,
 )
-from grid import Grid
-from entities import Plant, Zombie
 
-def confirm_quit():
-    """
-    显示退出确认窗口
-    返回 True 表示确认退出，False 表示取消
-    """
-    try:
-        import tkinter.messagebox as msgbox
-        result = msgbox.askyesno("退出游戏", "确定要退出游戏吗？")
-        return result
-    except:
-        # 如果 tkinter 不可用，直接返回 True
-        return True
-
-def create_shovel_icon():
-    """
-    创建铲子图标
-    返回一个 Surface 对象
-    """
-    icon_size = 50
-    icon = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
-    
-    # 绘制铲子（简单的几何图形）
-    # 铲子把手（比棕框稍淡的棕色）
-    pygame.draw.rect(icon, (174, 104, 54), (20, 5, 8, 25))
-    # 铲子头部（灰色金属）
-    pygame.draw.ellipse(icon, (128, 128, 128), (10, 25, 30, 20))
-    # 铲子边缘高光
-    pygame.draw.ellipse(icon, (180, 180, 180), (12, 27, 26, 16), 2)
-    
-    return icon
-
-def draw_health_bar(surface, entity):
+# 导入完成的时间（--startup-profile）
+IMPORTS_DONE = time.perf_counter()
+
+def main(seed=None, record_path=None, profile_csv=None, lawn=(GRID_ROWS, GRID_COLS),
+         autosave_path=None, resume_path=None, worker=False, startup_profile=False):
     """
-    在实体头顶绘制血量条
-    entity: Plant 或 Zombie 对象
+    seed: 随机种子，不传时随机选一个
+    record_path: 录制回放文件的路径，不传则不录制
+    profile_csv: 把每帧分阶段耗时写入该 CSV 文件，不传则不写
+    lawn: 草坪大小 (行数, 列数)，比窗口大时用方向键滚动
+    autosave_path: 定期自动存档的路径（可包含 {tick}），不传则不存档
+    resume_path: 从该存档继续游戏（草坪大小、随机种子等都以存档为准）
+    worker: 为 True 时逻辑在子进程中运行，主进程只负责输入和绘制（见 worker.py）
+    startup_profile: 为 True 时在第一帧画完后打印启动各阶段耗时
     """
-    # 血量条参数
-    bar_width = 50
-    bar_height = 6
-    # 根据实体类型设置不同的偏移量
-    # 使用 type(entity).__name__ 来检查类型，避免循环导入
-    if type(entity).__name__ == 'Plant':
-        offset_y = -17.5  # 植物血条高度（原来的一半）
-    else:
-        offset_y = -17.5  # 僵尸血条高度（half）
-    
-    # 计算血量百分比
-    hp_ratio = max(0, min(1, entity.hp / entity.max_hp))
-    
-    # 血量条位置（实体头顶）
-    bar_x = entity.rect.centerx - bar_width // 2
-    bar_y = entity.rect.top + offset_y
-    
-    # 绘制背景（灰色）
-    bg_rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
-    pygame.draw.rect(surface, (100, 100, 100), bg_rect)
-    
-    # 绘制血量（根据血量百分比变色：绿色->黄色->红色）
-    hp_width = int(bar_width * hp_ratio)
-    if hp_ratio > 0.6:
-        hp_color = (0, 255, 0)  # 绿色
-    elif hp_ratio > 0.3:
-        hp_color = (255, 255, 0)  # 黄色
-    else:
-        hp_color = (255, 0, 0)  # 红色
-    
-    if hp_width > 0:
-        hp_rect = pygame.Rect(bar_x, bar_y, hp_width, bar_height)
-        pygame.draw.rect(surface, hp_color, hp_rect)
-    
-    # 绘制边框
-    pygame.draw.rect(surface, (0, 0, 0), bg_rect, 1)
-
-def main():
-    pygame.init()
+    startup = StartupProfile(STARTUP_T0) if startup_profile else None
+    if startup:
+        startup.mark("导入模块", IMPORTS_DONE)
+
+    # 只初始化用到的子系统（窗口和字体），不启动音频、手柄等
+    pygame.display.init()
+    pygame.font.init()
     pygame.display.set_caption("简化版 植物大战僵尸 - Pygame Demo")
 
     # 创建窗口
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
+    if startup:
+        startup.mark("初始化窗口")
+
+    # 实体图像在窗口创建后一次生成好（已转换为屏幕像素格式）
+    preload_images()
+    if startup:
+        startup.mark("预生成图像")
+
+    # 创建网格对象和逻辑模拟（植物、僵尸、子弹、plant_grid 都由 Simulation 持有）
+    # lite 后端的实体没有图像，窗口模式下改用 sprite 后端
+    backend = "sprite" if SIM_BACKEND == "lite" else SIM_BACKEND
+    if resume_path:
+        sim = load_snapshot(resume_path)
+        if sim.backend == "lite":
+            sim = load_snapshot(resume_path, "sprite")
+        grid = sim.grid
+        seed = sim.seed
+    else:
+        grid = Grid(*lawn)
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        if worker:
+            sim = RemoteSimulation(grid, backend=backend, seed=seed)
+        else:
+            sim = create_simulation(grid, backend=backend, seed=seed)
+    plants = sim.plants
+    zombies = sim.zombies
+    bullets = sim.bullets
+
+    # 帧调度：逻辑按固定步长 SIM_TICK_MS 推进，超出帧预算时降级或跳过绘制
+    pacer = FramePacer()
 
-    # 创建网格对象
-    grid = Grid()
-
-    # 精灵组：
-    plants = pygame.sprite.Group()   # 所有植物
-    zombies = pygame.sprite.Group()  # 所有僵尸
-    bullets = pygame.sprite.Group()  # 所有子弹
-
-    # 用一个二维数组记录每个格子是否已经有植物（防止重复种植）
-    # None 表示该格子为空；否则存储 Plant 对象
-    plant_grid = [[None for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
-
-    # 僵尸生成计时器
-    last_zombie_spawn_time = pygame.time.get_ticks()
-
-    # 游戏结束标志
-    game_over = False
-    # 使用Windows中文字体，避免乱码
-    try:
-        font = pygame.font.Font("C:/Windows/Fonts/msyh.ttc", 24)  # 微软雅黑
-    except:
-        try:
-            font = pygame.font.Font("C:/Windows/Fonts/simhei.ttf", 24)  # 黑体
-        except:
-            font = pygame.font.SysFont("simhei", 24)  # 备用方案
-    
-    # ========== 铲子功能相关变量 ==========
-    shovel_icon = create_shovel_icon()
-    shovel_rect = shovel_icon.get_rect()
-    shovel_rect.topright = (SCREEN_WIDTH - 10, 10)  # 右上角位置
+    # 绘制层：持有预渲染背景，按 RENDER_MODE 整屏或局部刷新
+    renderer = Renderer(screen, grid)
+    # 摄像机：实体和格子都使用世界坐标，鼠标位置要先换算
+    camera = renderer.camera
+
+    # 中文字体：依次尝试 FONT_CANDIDATES，找不到时按名字匹配系统字体，查找结果缓存在 FONT_CACHE_FILE
+    font = load_font(FONT_SIZE)
+    if startup:
+        startup.mark("加载字体")
+
+    # 界面层：文字、铲子图标、按钮和暂停遮罩都只生成一次
+    hud = Hud(font)
+
+    # 输入录制：只记录种植、铲除、暂停以及发生时的逻辑帧号
+    recorder = ReplayRecorder(seed, sim.backend, lawn) if record_path else None
+
+    # 自动存档：打包快照在主循环中完成，写文件在后台线程
+    autosaver = Autosaver(autosave_path) if autosave_path else None
+
+    # 分阶段耗时统计：F3 显示统计面板
+    profiler = FrameProfiler(csv_path=profile_csv)
+    sim.profiler = profiler
+
+    if startup:
+        startup.mark("创建模拟和界面")
+
+    # ========== 界面状态 ==========
     shovel_selected = False  # 铲子是否被选中
-    shovel_alpha = 255  # 铲子图标透明度（255 = 完全不透明）
-    # 铲子下层棕色框（用于取消选中）- 固定在右上角，不随鼠标移动
-    shovel_bg_rect = pygame.Rect(SCREEN_WIDTH - 60, 10, 50, 50)
-    shovel_bg_color = (139, 69, 19)  # 棕色
-    # 右上角固定位置的铲子图标（选中时显示半透明）
-    fixed_shovel_rect = pygame.Rect(SCREEN_WIDTH - 60, 10, 50, 50)
-    # =====================================
-    
-    # ========== 游戏控制相关变量 ==========
-    game_paused = False  # 游戏是否暂停
-    pause_button_rect = pygame.Rect(SCREEN_WIDTH - 180, SCREEN_HEIGHT - 50, 80, 40)  # 暂停按钮（右下角）
-    quit_button_rect = pygame.Rect(SCREEN_WIDTH - 90, SCREEN_HEIGHT - 50, 80, 40)  # 退出按钮（右下角）
+    game_paused = bool(resume_path)  # 游戏是否暂停（读档后先暂停，按空格继续）
+    confirming_quit = False  # 是否显示退出确认框（显示期间逻辑暂停，主循环照常运行）
+    time_scale_index = 0  # 当前游戏速度在 TIME_SCALES 中的下标（0 即 1 倍速）
     # =====================================
 
     # 主循环
@@ -158,11 +147,26 @@ def main():
     while running:
         # 计算 dt：本帧经过的毫秒数
         dt = clock.tick(FPS)
+        pacer.begin_frame()
+        game_over = sim.game_over
+        profiler.begin_frame()
 
         # 1. 事件处理
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            # 窗口被遮挡后重新露出时，局部刷新模式下也要整屏重画一次
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                renderer.invalidate()
+
+            # 退出确认框打开时只处理确认框的输入，其他操作暂时无效
+            if confirming_quit:
+                choice = hud.confirm_choice(event)
+                if choice is not None:
+                    confirming_quit = False
+                    if choice:
+                        running = False
+                continue
 
             # ========== 键盘快捷键处理 ==========
             if event.type == pygame.KEYDOWN:
@@ -170,10 +174,17 @@ def main():
                 if event.key == pygame.K_SPACE:
                     if not game_over:
                         game_paused = not game_paused
-                # Q键退出游戏（弹出确认窗口）
+                        if recorder:
+                            recorder.pause(sim.tick_count, game_paused)
+                # Q键退出游戏（先显示确认框）
                 elif event.key == pygame.K_q:
-                    if confirm_quit():
-                        running = False
+                    confirming_quit = True
+                # F3 显示 / 隐藏分阶段耗时面板
+                elif event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                # T 键循环切换游戏速度（1x / 2x / 4x / 16x）
+                elif event.key == pygame.K_t:
+                    time_scale_index = (time_scale_index + 1) % len(TIME_SCALES)
             # =====================================
 
             # 鼠标点击处理
@@ -181,234 +192,139 @@ def main():
                 # 左键点击
                 if not game_over:
                     mouse_pos = pygame.mouse.get_pos()
+                    world_pos = camera.to_world(mouse_pos)
                     
                     # ========== 游戏控制按钮处理 ==========
                     # 检查是否点击了暂停按钮
-                    if pause_button_rect.collidepoint(mouse_pos):
+                    if hud.pause_button_rect.collidepoint(mouse_pos):
                         if not game_over:
                             game_paused = not game_paused
+                            if recorder:
+                                recorder.pause(sim.tick_count, game_paused)
                     # 检查是否点击了退出按钮
-                    elif quit_button_rect.collidepoint(mouse_pos):
-                        if confirm_quit():
-                            running = False
+                    elif hud.quit_button_rect.collidepoint(mouse_pos):
+                        confirming_quit = True
                     # =====================================
                     
                     # ========== 铲子功能处理 ==========
                     # 如果铲子已选中，优先检查是否点击了植物或棕色框
                     if shovel_selected:
                         # 检查是否点击了棕色框（取消选中）- 棕色框固定在右上角
-                        if shovel_bg_rect.collidepoint(mouse_pos):
+                        if hud.shovel_bg_rect.collidepoint(mouse_pos):
                             shovel_selected = False
-                            shovel_alpha = 255
                         else:
-                            # 检查点击位置是否有植物（扩大检测范围，确保能检测到）
-                            clicked_plant = None
-                            for plant in plants:
-                                # 扩大检测范围：不仅检测rect中心，还检测整个rect区域
-                                # 使用更大的碰撞检测区域，确保点击植物时能检测到
-                                expanded_rect = plant.rect.inflate(10, 10)  # 扩大10像素
-                                if expanded_rect.collidepoint(mouse_pos):
-                                    clicked_plant = plant
-                                    break
-                            
-                            if clicked_plant:
-                                # 移除植物
-                                clicked_plant.kill()
-                                # 清理 plant_grid
-                                for row in range(len(plant_grid)):
-                                    for col in range(len(plant_grid[row])):
-                                        if plant_grid[row][col] == clicked_plant:
-                                            plant_grid[row][col] = None
+                            # 检查点击位置是否有植物，有则移除
+                            if sim.remove_plant_at(world_pos):
+                                if recorder:
+                                    recorder.shovel(sim.tick_count, world_pos)
                                 # 取消铲子选中状态
                                 shovel_selected = False
-                                shovel_alpha = 255
                     # 如果铲子未选中，检查是否点击了铲子图标或种植植物
                     else:
                         # 检查是否点击了铲子图标（使用固定的右上角位置检测）
-                        if fixed_shovel_rect.collidepoint(mouse_pos):
-                            shovel_selected = True
-                            shovel_alpha = 128  # 选中时降低透明度（半透明）
+                        if hud.fixed_shovel_rect.collidepoint(mouse_pos):
+                            shovel_selected = True  # 选中后图标显示为半透明
                         else:
                             # 正常种植植物
-                            cell_indices = grid.get_cell_indices_from_pos(mouse_pos)
+                            cell_indices = grid.get_cell_indices_from_pos(world_pos)
                             if cell_indices is not None:
                                 row, col = cell_indices
                                 # 如果当前格子没有植物，则种一棵
-                                if plant_grid[row][col] is None:
-                                    cell_center = grid.get_cell_center(row, col)
-                                    new_plant = Plant(cell_center)
-                                    plants.add(new_plant)
-                                    plant_grid[row][col] = new_plant
+                                if sim.add_plant(row, col) is not None and recorder:
+                                    recorder.plant(sim.tick_count, row, col)
                     # =====================================
 
-        # 2. 游戏逻辑更新（若已游戏结束或暂停，则不再更新实体）
-        if not game_over and not game_paused:
-            current_time = pygame.time.get_ticks()
-
-            # 2.1 生成僵尸（根据时间间隔）
-            if current_time - last_zombie_spawn_time >= ZOMBIE_SPAWN_INTERVAL:
-                last_zombie_spawn_time = current_time
-                # 随机选择一行
-                spawn_row = random.randint(0, GRID_ROWS - 1)
-                # 僵尸从屏幕右侧外生成（稍微靠内一点，确保立即可见）
-                spawn_x = SCREEN_WIDTH - 20
-                # 找到这行中任意一个格子，取其 y 中心即可
-                spawn_y = grid.cells[spawn_row][0].centery
-                new_zombie = Zombie((spawn_x, spawn_y))
-                zombies.add(new_zombie)
-
-            # 2.2 更新植物、僵尸、子弹
-            plants.update(dt)
-            zombies.update(dt)
-            bullets.update(dt)
-
-            # 2.3 植物自动开火（当前行有僵尸则开火）
-            for plant in plants:
-                # 判断该植物所在行是否有僵尸（简单通过 y 坐标近似比较）
-                row_has_zombie = any(
-                    abs(zombie.rect.centery - plant.rect.centery) < 10
-                    for zombie in zombies
-                )
-                if row_has_zombie and plant.can_fire(current_time):
-                    plant.fire(bullets)
-
-            # 2.4 子弹与僵尸碰撞检测
-            # groupcollide 返回一个字典：{bullet: [zombies...]}
-            # 使用自定义碰撞函数，确保碰撞检测准确
-            collisions = pygame.sprite.groupcollide(
-                bullets, zombies, True, False,  # True: 碰撞后删除子弹；False: 先不删僵尸
-                pygame.sprite.collide_rect  # 使用矩形碰撞检测
-            )
-            for bullet, hit_zombies in collisions.items():
-                for zombie in hit_zombies:
-                    zombie.take_damage(bullet.damage)
-                    # 碰撞时打印信息（调试用，可选）
-                    # print(f"子弹命中僵尸！僵尸剩余血量: {zombie.hp}")
-
-            # 2.5 僵尸与植物碰撞检测
-            # ========== 僵尸移动和碰撞处理逻辑 ==========
-            # 先重置所有僵尸的攻击状态
-            for zombie in zombies:
-                zombie.is_attacking = False
-            
-            # 然后检测碰撞并更新状态
-            for zombie in zombies:
-                # 如果僵尸到达屏幕左侧（突破防线），判定游戏结束
-                if zombie.rect.left <= 0:
-                    game_over = True
-                    break
-
-                # 僵尸与所有植物的碰撞检测
-                for plant in plants:
-                    if zombie.rect.colliderect(plant.rect):
-                        # 标记僵尸正在攻击植物（这样僵尸会停止移动）
-                        zombie.is_attacking = True
-                        # 僵尸在这一帧对植物造成伤害
-                        plant.take_damage(zombie.attack_damage_per_frame)
-                        # 碰撞时打印信息（调试用，可选）
-                        # print(f"僵尸攻击植物！植物剩余血量: {plant.hp}")
-                        break  # 一个僵尸只攻击一个植物
-            # ==========================================
-
-            # 2.6 维护 plant_grid：如果植物死亡，则清理对应格子
-            for row in range(len(plant_grid)):
-                for col in range(len(plant_grid[row])):
-                    p = plant_grid[row][col]
-                    if p is not None and not p.alive():
-                        plant_grid[row][col] = None
-
-        # 3. 绘制
-        screen.fill(WHITE)
-
-        # 3.1 画网格
-        grid.draw(screen)
-
-        # 3.2 画植物、僵尸、子弹
-        plants.draw(screen)
-        zombies.draw(screen)
-        bullets.draw(screen)
-        
-        # 3.2.1 绘制所有实体的血量条
-        for plant in plants:
-            draw_health_bar(screen, plant)
-        for zombie in zombies:
-            draw_health_bar(screen, zombie)
-
-        # 3.3 显示简单文字信息
-        text_surface = font.render(
-            "左键点击格子种植植物  |  僵尸到达左侧则游戏结束",
-            True,
-            BLACK,
+        # 方向键滚动视口（草坪不超过窗口时摄像机不会移动）
+        keys = pygame.key.get_pressed()
+        scroll = CAMERA_SCROLL_SPEED * dt / 1000
+        camera.scroll(
+            (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * scroll,
+            (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * scroll,
         )
-        screen.blit(text_surface, (50, 10))
-        
-        # 3.4 绘制铲子图标
-        # ========== 铲子图标绘制 ==========
-        # 棕色背景框始终固定在右上角（最底层）
-        pygame.draw.rect(screen, shovel_bg_color, shovel_bg_rect)
-        pygame.draw.rect(screen, BLACK, shovel_bg_rect, 2)  # 边框
-        
-        if shovel_selected:
-            # 如果铲子被选中，跟随鼠标的铲子图标
-            mouse_pos = pygame.mouse.get_pos()
-            shovel_rect.center = mouse_pos
-            # 绘制跟随鼠标的铲子图标（半透明）
-            shovel_icon.set_alpha(shovel_alpha)
-            screen.blit(shovel_icon, shovel_rect)
-            
-            # 右上角显示固定的半透明铲子图标
-            fixed_shovel_icon = create_shovel_icon()
-            fixed_shovel_icon.set_alpha(128)  # 半透明
-            screen.blit(fixed_shovel_icon, fixed_shovel_rect)
+        profiler.mark(PHASE_EVENTS)
+
+        # 2. 游戏逻辑更新（若已游戏结束或暂停，则不再更新实体）
+        # 按固定步长推进模拟；快进时真实时间乘以倍率，一个渲染帧内跑多个逻辑步
+        # 单帧最多补跑 MAX_CATCH_UP_TICKS × 倍率 步，多余的时间直接丢弃
+        time_scale = TIME_SCALES[time_scale_index]
+        if not game_over and not game_paused and not confirming_quit:
+            pacer.run_logic(sim, dt, time_scale)
+            game_over = sim.game_over
+            if autosaver:
+                autosaver.maybe_save(sim)
         else:
-            # 如果未选中，固定在右上角（完全不透明）
-            shovel_rect.topright = (SCREEN_WIDTH - 10, 10)
-            shovel_icon.set_alpha(255)
-            screen.blit(shovel_icon, shovel_rect)
-        # =====================================
-        
-        # 3.5 绘制游戏控制按钮
-        # ========== 暂停和退出按钮绘制 ==========
-        # 绘制暂停按钮
-        pause_color = (100, 150, 200) if not game_paused else (200, 150, 100)
-        pygame.draw.rect(screen, pause_color, pause_button_rect)
-        pygame.draw.rect(screen, BLACK, pause_button_rect, 2)
-        pause_text = font.render("暂停" if not game_paused else "继续", True, BLACK)
-        pause_text_rect = pause_text.get_rect(center=pause_button_rect.center)
-        screen.blit(pause_text, pause_text_rect)
-        
-        # 绘制退出按钮
-        pygame.draw.rect(screen, (200, 100, 100), quit_button_rect)
-        pygame.draw.rect(screen, BLACK, quit_button_rect, 2)
-        quit_text = font.render("退出", True, BLACK)
-        quit_text_rect = quit_text.get_rect(center=quit_button_rect.center)
-        screen.blit(quit_text, quit_text_rect)
-        # =====================================
-        
-        # 3.6 显示暂停提示
-        if game_paused:
-            pause_surface = font.render("游戏已暂停 - 按空格键继续", True, (255, 0, 0))
-            pause_rect = pause_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            # 绘制半透明背景
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(128)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-            screen.blit(pause_surface, pause_rect)
-
-        if game_over:
-            over_surface = font.render(
-                "游戏结束！关掉窗口退出。", True, (255, 0, 0)
-            )
-            screen.blit(over_surface, (SCREEN_WIDTH // 2 - 100, 10))
-
-        # 4. 刷新屏幕
-        pygame.display.flip()
+            pacer.reset_accumulator()
+
+        # 3. 绘制（超出帧预算时先省略血量条和提示文字，仍然超出则跳过本帧绘制）
+        render_level = pacer.choose_render()
+        if render_level != RENDER_SKIP:
+            detail = render_level == RENDER_FULL
+            sim.sync_views(camera.rect)
+
+            # 3.1 画背景（白底 + 预渲染的网格）
+            renderer.begin_frame()
+            profiler.mark(PHASE_BACKGROUND)
+
+            # 3.2 画植物、僵尸、子弹，以及所有实体的血量条（一次批量提交）
+            renderer.draw_entities(plants, zombies, bullets, detail)
+            profiler.mark(PHASE_ENTITIES)
+
+            # 3.3 - 3.7 文字、铲子、按钮、暂停提示、退出确认框
+            hud.draw(renderer, shovel_selected, game_paused, game_over, pygame.mouse.get_pos(), time_scale, detail,
+                     confirming_quit)
+            if profiler.overlay_visible:
+                profiler.draw_overlay(renderer, font, (pacer.summary(),))
+            profiler.mark(PHASE_HUD)
+
+            # 4. 刷新屏幕
+            renderer.end_frame()
+            profiler.mark(PHASE_FLIP)
+            if startup:
+                startup.mark("第一帧")
+                print(startup.report())
+                startup = None
+        pacer.end_render(render_level)
+        profiler.end_frame(*sim.entity_counts())
+
+    if recorder:
+        recorder.save(record_path, sim.tick_count)
+    if autosaver:
+        autosaver.close()
+    if worker:
+        sim.close()
+    profiler.close()
 
     pygame.quit()
     sys.exit()
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    import multiprocessing
+
+    # 打包成 exe 后，--worker 启动的子进程也会执行这里，必须先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="简化版植物大战僵尸")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（不传则随机）")
+    parser.add_argument("--record", metavar="PATH", default=None, help="把本局输入录制为回放文件")
+    parser.add_argument("--profile-csv", metavar="PATH", default=None, help="把每帧分阶段耗时写入 CSV 文件")
+    parser.add_argument("--lawn", metavar="ROWSxCOLS", type=parse_lawn_size, default=(GRID_ROWS, GRID_COLS),
+                        help=f"草坪大小，例如 20x200（默认 {GRID_ROWS}x{GRID_COLS}）")
+    parser.add_argument("--autosave", metavar="PATH", default=None,
+                        help="定期自动存档到 PATH（可包含 {tick}，每个检查点单独保存）")
+    parser.add_argument("--resume", metavar="PATH", default=None, help="从存档继续游戏")
+    parser.add_argument("--startup-profile", action="store_true", help="第一帧画完后打印启动各阶段耗时")
+    parser.add_argument("--worker", action="store_true",
+                        help="逻辑在子进程中运行，通过共享内存把状态交给主进程绘制")
+    args = parser.parse_args()
+    if args.resume and args.record:
+        # 回放从第 0 帧开始重现，无法接在存档后面
+        parser.error("--resume 不能与 --record 同时使用")
+    if args.worker and (args.autosave or args.resume):
+        # 完整的模拟状态只在子进程中，主进程无法打包快照
+        parser.error("--worker 不能与 --autosave / --resume 同时使用")
+    main(seed=args.seed, record_path=args.record, profile_csv=args.profile_csv, lawn=args.lawn,
+         autosave_path=args.autosave, resume_path=args.resume, worker=args.worker,
+         startup_profile=args.startup_profile)
 
@@ -0,0 +1,152 @@
+"""
+帧预算调度：
+- 逻辑始终按固定步长 SIM_TICK_MS 推进，单帧最多补跑 MAX_CATCH_UP_TICKS × 倍率 步
+- 绘制根据负载降级：预计本帧（已用的逻辑时间 + 绘制耗时估计）超出 FRAME_BUDGET_MS 时，
+  先去掉细节（血量条、提示文字），仍然超出则跳过本帧绘制，但最多连续跳过 MAX_RENDER_SKIP 帧
+- 统计跳过的帧数、降级的帧数、补跑深度和被丢弃的时间，供统计面板显示
+
+这样怪物很多时游戏时间仍然按真实时间流逝（掉帧），而不是整体变成慢动作。
+"""
+
+import time
+
+from settings import (
+    SIM_TICK_MS,
+    MAX_CATCH_UP_TICKS,
+    FRAME_BUDGET_MS,
+    MAX_RENDER_SKIP,
+    DEGRADE_DETAIL_UNDER_LOAD,
+)
+
+# 绘制级别
+RENDER_FULL = 0      # 完整绘制
+RENDER_REDUCED = 1   # 降级绘制：不画血量条和提示文字
+RENDER_SKIP = 2      # 跳过本帧绘制
+
+# 绘制耗时估计的平滑系数（指数滑动平均，越大越跟手）
+RENDER_COST_SMOOTHING = 0.2
+
+class FramePacer:
+    """
+    每帧调用顺序：begin_frame() -> run_logic(...) -> choose_render() -> [绘制] -> end_render(level)
+    """
+
+    def __init__(
+        self,
+        budget_ms=FRAME_BUDGET_MS,
+        max_catch_up=MAX_CATCH_UP_TICKS,
+        max_skip=MAX_RENDER_SKIP,
+        degrade=DEGRADE_DETAIL_UNDER_LOAD,
+    ):
+        """
+        budget_ms: 每帧（逻辑 + 绘制）的时间预算（毫秒）
+        max_catch_up: 1 倍速时单帧最多补跑的逻辑帧数
+        max_skip: 最多连续跳过的绘制帧数，保证画面至少隔几帧更新一次
+        degrade: 超出预算时是否先降级绘制再跳帧
+        """
+        self.budget_ms = budget_ms
+        self.max_catch_up = max_catch_up
+        self.max_skip = max_skip
+        self.degrade = degrade
+
+        # 尚未消化的游戏时间（毫秒）
+        self.accumulator = 0
+        self._frame_start = time.perf_counter()
+        self._render_start = self._frame_start
+        # 两种绘制级别各自的耗时估计（毫秒）
+        self._render_cost = {RENDER_FULL: 0.0, RENDER_REDUCED: 0.0}
+        self._skipped_in_row = 0
+
+        # ========== 统计 ==========
+        self.frames = 0
+        self.skipped_frames = 0     # 跳过绘制的帧数
+        self.reduced_frames = 0     # 降级绘制的帧数
+        self.catch_up_depth = 0     # 本帧推进的逻辑帧数
+        self.max_catch_up_depth = 0
+        self.dropped_ms = 0.0       # 超过补跑上限被丢弃的游戏时间
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def run_logic(self, sim, dt, time_scale=1):
+        """
+        把本帧经过的真实时间 dt（乘以倍率）按固定步长交给模拟，返回推进的逻辑帧数
+        """
+        self.accumulator += dt * time_scale
+        max_steps = self.max_catch_up * time_scale
+        steps = 0
+        while self.accumulator >= SIM_TICK_MS and steps < max_steps:
+            sim.step(SIM_TICK_MS)
+            self.accumulator -= SIM_TICK_MS
+            steps += 1
+            if sim.game_over:
+                break
+        if steps == max_steps and self.accumulator >= SIM_TICK_MS:
+            # 追不上了：丢掉积压的时间，避免“死亡螺旋”
+            self.dropped_ms += self.accumulator
+            self.accumulator = 0
+        self.catch_up_depth = steps
+        self.max_catch_up_depth = max(self.max_catch_up_depth, steps)
+        return steps
+
+    def reset_accumulator(self):
+        """
+        暂停或游戏结束时调用，暂停期间的时间不计入游戏时间
+        """
+        self.accumulator = 0
+        self.catch_up_depth = 0
+
+    def choose_render(self):
+        """
+        根据本帧已用时间和绘制耗时估计，决定本帧的绘制级别
+        """
+        self._render_start = time.perf_counter()
+        elapsed = (self._render_start - self._frame_start) * 1000
+        if elapsed + self._render_cost[RENDER_FULL] <= self.budget_ms:
+            level = RENDER_FULL
+        elif self.degrade and elapsed + self._render_cost[RENDER_REDUCED] <= self.budget_ms:
+            level = RENDER_REDUCED
+        elif self._skipped_in_row < self.max_skip:
+            level = RENDER_SKIP
+        else:
+            # 已连续跳过太多帧，这一帧必须画（尽量用便宜的方式）
+            level = RENDER_REDUCED if self.degrade else RENDER_FULL
+        return level
+
+    def end_render(self, level):
+        """
+        绘制结束（或跳过）后调用，更新绘制耗时估计和统计
+        """
+        self.frames += 1
+        if level == RENDER_SKIP:
+            self.skipped_frames += 1
+            self._skipped_in_row += 1
+            return
+        self._skipped_in_row = 0
+        if level == RENDER_REDUCED:
+            self.reduced_frames += 1
+        cost = (time.perf_counter() - self._render_start) * 1000
+        estimate = self._render_cost[level]
+        self._render_cost[level] = estimate + (cost - estimate) * RENDER_COST_SMOOTHING
+        if level == RENDER_FULL and self._render_cost[RENDER_REDUCED] > self._render_cost[RENDER_FULL]:
+            # 降级绘制不会比完整绘制更贵
+            self._render_cost[RENDER_REDUCED] = self._render_cost[RENDER_FULL]
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped_frames,
+            "reduced": self.reduced_frames,
+            "catch_up_depth": self.catch_up_depth,
+            "max_catch_up_depth": self.max_catch_up_depth,
+            "dropped_ms": self.dropped_ms,
+        }
+
+    def summary(self):
+        """
+        一行文字摘要，显示在统计面板上
+        """
+        return (
+            f"跳帧 {self.skipped_frames} 降级 {self.reduced_frames} "
+            f"补跑 {self.catch_up_depth}/{self.max_catch_up_depth} 丢弃 {self.dropped_ms:.0f} ms"
+        )
@@ -0,0 +1,178 @@
+"""
+分阶段帧耗时统计：
+- 主循环和 Simulation.step() 在每个阶段结束时调用 mark()，用 perf_counter_ns 计时
+- 每个阶段保留最近 PROFILER_HISTORY_FRAMES 帧的样本（固定大小的环形缓冲区），维护滚动平均
+- 可选把每帧样本写入 CSV 文件
+- 按 F3 显示 / 隐藏屏幕左下角的统计面板（各阶段平均耗时 + 实体数量）
+- StartupProfile 记录从启动到第一帧画完的各阶段耗时（python main.py --startup-profile）
+"""
+
+import csv
+import time
+from array import array
+
+import pygame
+
+from settings import PROFILER_HISTORY_FRAMES, SCREEN_HEIGHT
+
+# 阶段编号与名称（编号即 mark() 的参数）
+PHASE_EVENTS = 0
+PHASE_SPAWN = 1
+PHASE_UPDATE = 2
+PHASE_FIRE = 3
+PHASE_BULLET_HIT = 4
+PHASE_ZOMBIE_BITE = 5
+PHASE_HORDE = 6
+PHASE_BACKGROUND = 7
+PHASE_ENTITIES = 8
+PHASE_HUD = 9
+PHASE_FLIP = 10
+
+PHASE_NAMES = (
+    "1 事件处理",
+    "2.1 生成僵尸",
+    "2.2 实体更新",
+    "2.3 自动开火",
+    "2.4 子弹碰撞",
+    "2.5 僵尸啃食",
+    "2.6 合并僵尸群",
+    "3.1 背景",
+    "3.2 实体绘制",
+    "3.3-3.7 界面",
+    "4 刷新屏幕",
+)
+
+# 面板文字多久重新生成一次（帧），避免每帧都渲染一遍文字
+OVERLAY_REFRESH_FRAMES = 15
+
+class FrameProfiler:
+    """
+    每帧调用顺序：begin_frame() -> 若干次 mark(phase) -> end_frame(plants, zombies, bullets)
+    同一帧内同一阶段可以 mark 多次（例如一帧补跑多个逻辑步），耗时会累加
+    """
+
+    def __init__(self, history=PROFILER_HISTORY_FRAMES, csv_path=None):
+        """
+        history: 环形缓冲区长度（帧）
+        csv_path: 不为 None 时把每帧样本写入该 CSV 文件
+        """
+        self.history = history
+        n = len(PHASE_NAMES)
+        # 每个阶段一个预分配的环形缓冲区（纳秒）
+        self._samples = [array("q", bytes(8 * history)) for _ in range(n)]
+        self._sums = [0] * n
+        self._current = [0] * n
+        self._cursor = 0
+        self.frames = 0
+        self._last = time.perf_counter_ns()
+        self.counts = (0, 0, 0)
+
+        self.overlay_visible = False
+        self._overlay_lines = []
+
+        self._csv_file = None
+        self._csv = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(["frame"] + [f"{name} (ns)" for name in PHASE_NAMES] + ["plants", "zombies", "bullets"])
+
+    def begin_frame(self):
+        """
+        开始计时新的一帧
+        """
+        self._current = [0] * len(PHASE_NAMES)
+        self._last = time.perf_counter_ns()
+
+    def mark(self, phase):
+        """
+        记录从上一次 mark（或 begin_frame）到现在的耗时，计入 phase 阶段
+        """
+        now = time.perf_counter_ns()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self, plants=0, zombies=0, bullets=0):
+        """
+        把本帧样本写入环形缓冲区（以及 CSV），传入本帧的实体数量
+        """
+        cursor = self._cursor
+        for phase, value in enumerate(self._current):
+            samples = self._samples[phase]
+            self._sums[phase] += value - samples[cursor]
+            samples[cursor] = value
+        self._cursor = (cursor + 1) % self.history
+        self.frames += 1
+        self.counts = (plants, zombies, bullets)
+
+        if self._csv is not None:
+            self._csv.writerow([self.frames] + self._current + [plants, zombies, bullets])
+
+    def averages_ms(self):
+        """
+        各阶段最近若干帧的平均耗时（毫秒），顺序与 PHASE_NAMES 相同
+        """
+        filled = min(self.frames, self.history) or 1
+        return [total / filled / 1e6 for total in self._sums]
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self._overlay_lines = []
+
+    def draw_overlay(self, renderer, font, extra_lines=()):
+        """
+        在屏幕左下角绘制统计面板
+        extra_lines: 附加在面板末尾的文字行（例如帧调度统计）
+        """
+        if not self._overlay_lines or self.frames % OVERLAY_REFRESH_FRAMES == 0:
+            averages = self.averages_ms()
+            lines = [f"{name:<12s}{avg:7.3f} ms" for name, avg in zip(PHASE_NAMES, averages)]
+            lines.append(f"合计 {sum(averages):.3f} ms")
+            lines.append("植物 {} 僵尸 {} 子弹 {}".format(*self.counts))
+            lines.extend(extra_lines)
+            self._overlay_lines = [font.render(line, True, (255, 255, 255)) for line in lines]
+
+        line_height = font.get_linesize()
+        width = max(surface.get_width() for surface in self._overlay_lines) + 10
+        height = line_height * len(self._overlay_lines) + 10
+        panel = pygame.Rect(5, SCREEN_HEIGHT - height - 5, width, height)
+        renderer.draw_rect((0, 0, 0), panel)
+        for i, surface in enumerate(self._overlay_lines):
+            renderer.blit(surface, (panel.x + 5, panel.y + 5 + i * line_height))
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv = None
+
+class StartupProfile:
+    """
+    启动耗时：从 start 开始，每完成一个阶段调用一次 mark(name)，最后 report() 返回报告文字
+    """
+
+    def __init__(self, start=None):
+        """
+        start: 起点的 perf_counter() 值（例如 main.py 第一行记下的时间），不传则从现在开始
+        """
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []
+
+    def mark(self, name, now=None):
+        """
+        记录从上一次 mark 到 now（perf_counter() 值，不传则为现在）的耗时
+        """
+        if now is None:
+            now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def report(self):
+        lines = ["启动耗时："]
+        rows = self.phases + [("合计", self._last - self.start)]
+        for name, seconds in rows:
+            # 中文占两列，按显示宽度补齐
+            padding = 16 - sum(2 if ord(c) > 127 else 1 for c in name)
+            lines.append(f"  {name}{' ' * padding}{seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
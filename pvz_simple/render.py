@@ -0,0 +1,199 @@
+"""
+绘制层：
+- 背景（白底 + 草坪网格中可见的部分）只在摄像机移动时重新生成，每帧直接 blit
+- 摄像机（camera.Camera）之外的实体不绘制；默认大小的草坪摄像机固定在 (0, 0)
+- 两种刷新模式（settings.RENDER_MODE）：
+  "full"  每帧铺满背景并 pygame.display.flip() 整屏刷新
+  "dirty" 只擦除上一帧画过的区域，并用 pygame.display.update(rects) 只刷新变化区域，
+          每帧开销与移动的实体数量成正比，而不是与屏幕大小成正比
+- 血量条使用预先画好的小图（按血条像素宽度和颜色量化），与实体图像一起用 Surface.blits() 批量提交
+"""
+
+import weakref
+
+import pygame
+
+from settings import RENDER_MODE, WHITE
+from camera import Camera
+
+# 血量条参数
+HEALTH_BAR_WIDTH = 50
+HEALTH_BAR_HEIGHT = 6
+HEALTH_BAR_OFFSET_Y = -17.5  # 血条相对实体顶部的偏移（植物和僵尸相同）
+
+class HealthBars:
+    """
+    预渲染的血量条：
+    - 血条外观只由“填充宽度 + 颜色”决定，最多 (宽度 + 1) × 3 种，每种只画一次
+    - 每个实体记住上次的 hp 和对应的血条图，hp 没变时直接复用
+    """
+
+    def __init__(self):
+        self._images = {}
+        # {实体: (上次的 hp, 血条图)}，实体死亡后自动释放
+        self._by_entity = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _build(hp_width, hp_color):
+        image = pygame.Surface((HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT))
+        # 绘制背景（灰色）
+        image.fill((100, 100, 100))
+        # 绘制血量
+        if hp_width > 0:
+            image.fill(hp_color, (0, 0, hp_width, HEALTH_BAR_HEIGHT))
+        # 绘制边框
+        pygame.draw.rect(image, (0, 0, 0), image.get_rect(), 1)
+        return image
+
+    def image_for_ratio(self, hp_ratio):
+        """
+        返回血量比例 hp_ratio（0~1）对应的血条图
+        """
+        hp_width = int(HEALTH_BAR_WIDTH * hp_ratio)
+        # 根据血量百分比变色：绿色->黄色->红色
+        if hp_ratio > 0.6:
+            hp_color = (0, 255, 0)
+        elif hp_ratio > 0.3:
+            hp_color = (255, 255, 0)
+        else:
+            hp_color = (255, 0, 0)
+        key = (hp_width, hp_color)
+        image = self._images.get(key)
+        if image is None:
+            image = self._build(hp_width, hp_color)
+            self._images[key] = image
+        return image
+
+    def image_for(self, entity):
+        """
+        返回实体当前血量对应的血条图；hp 和 max_hp 都没有变化时不重新计算
+        （僵尸群的 max_hp 会随成员数变化，worker 模式的视图也会换给别的实体使用）
+        """
+        key = (entity.hp, entity.max_hp)
+        cached = self._by_entity.get(entity)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        hp_ratio = max(0, min(1, entity.hp / entity.max_hp))
+        image = self.image_for_ratio(hp_ratio)
+        self._by_entity[entity] = (key, image)
+        return image
+
+class Renderer:
+    """
+    统一的绘制入口：所有 blit / 画矩形都经过这里，顺便记录本帧画过的区域
+    """
+
+    def __init__(self, screen, grid, mode=RENDER_MODE, camera=None):
+        """
+        screen: 显示窗口的 surface
+        grid: 草坪网格，用于生成静态背景
+        mode: "full" 或 "dirty"
+        camera: 摄像机，不传时按草坪大小新建一个（位于左上角）
+        """
+        self.screen = screen
+        self.mode = mode
+        self.grid = grid
+        self.camera = camera if camera is not None else Camera(grid.world_width, grid.world_height, *screen.get_size())
+
+        # 静态背景：白底 + 草坪的可见部分，摄像机移动后才重新生成
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self._background_pos = None
+
+        self.health_bars = HealthBars()
+
+        # 本帧和上一帧画过的区域；第一帧需要整屏刷新
+        self._dirty = []
+        self._last_dirty = [screen.get_rect()]
+
+    def _update_background(self):
+        """
+        摄像机移动过时重新生成背景，并让下一次刷新覆盖整屏
+        """
+        camera = self.camera
+        if self._background_pos == (camera.x, camera.y):
+            return
+        self._background_pos = (camera.x, camera.y)
+        self.background.fill(WHITE)
+        self.grid.draw(self.background, camera.rect)
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        下一帧强制整屏重画和刷新（摄像机移动、窗口被遮挡后重新露出等）
+        记在 _last_dirty 中：begin_frame() 按它恢复背景，end_frame() 按它刷新显示
+        """
+        self._last_dirty = [self.screen.get_rect()]
+
+    def begin_frame(self):
+        """
+        开始新的一帧：恢复背景
+        """
+        self._update_background()
+        if self.mode == "dirty":
+            # 只把上一帧画过的区域用背景盖掉
+            for rect in self._last_dirty:
+                self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.blit(self.background, (0, 0))
+        self._dirty = []
+
+    def blit(self, surface, dest):
+        """
+        在屏幕上绘制 surface，返回绘制区域
+        """
+        rect = self.screen.blit(surface, dest)
+        self._dirty.append(rect)
+        return rect
+
+    def draw_rect(self, color, rect, width=0):
+        """
+        在屏幕上画矩形，返回绘制区域
+        """
+        drawn = pygame.draw.rect(self.screen, color, rect, width)
+        self._dirty.append(drawn)
+        return drawn
+
+    def draw_entities(self, plants, zombies, bullets, with_health_bars=True):
+        """
+        一次性批量绘制所有实体及其血量条（血条画在所有实体之上）
+        只绘制与摄像机视野相交的实体
+        with_health_bars: 为 False 时不画血量条（负载过高时的降级绘制）
+        """
+        health_bars = self.health_bars
+        camera = self.camera
+        # 血条在实体上方，视野向上多留出血条的高度
+        view = camera.rect.inflate(0, (int(-HEALTH_BAR_OFFSET_Y) + 1) * 2)
+        colliderect = view.colliderect
+        offset = (-camera.x, -camera.y)
+        shifted = offset != (0, 0)
+        sequence = []
+        bars = []
+        for group in (plants, zombies):
+            for sprite in group:
+                rect = sprite.rect
+                if not colliderect(rect):
+                    continue
+                if shifted:
+                    rect = rect.move(offset)
+                sequence.append((sprite.image, rect))
+                if with_health_bars:
+                    bars.append((
+                        health_bars.image_for(sprite),
+                        (rect.centerx - HEALTH_BAR_WIDTH // 2, rect.top + HEALTH_BAR_OFFSET_Y),
+                    ))
+        for sprite in bullets:
+            rect = sprite.rect
+            if colliderect(rect):
+                sequence.append((sprite.image, rect.move(offset) if shifted else rect))
+        sequence.extend(bars)
+        self._dirty.extend(self.screen.blits(sequence))
+
+    def end_frame(self):
+        """
+        结束一帧：把画好的内容刷新到显示器
+        """
+        if self.mode == "dirty":
+            pygame.display.update(self._last_dirty + self._dirty)
+            self._last_dirty = self._dirty
+        else:
+            pygame.display.flip()
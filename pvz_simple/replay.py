@@ -0,0 +1,150 @@
+"""
+输入回放：
+- ReplayRecorder 只记录玩家输入（种植、铲除、暂停）以及发生时的逻辑帧号
+- 回放文件是紧凑的二进制格式：文件头 + 每条输入 13 字节
+- play_replay() 用相同的随机种子和草坪大小重新创建模拟，按帧号注入输入，不渲染、全速运行
+
+因为模拟只依赖自己的随机数生成器和模拟时钟，同一个回放每次的结果都完全一致。
+
+命令行用法：
+    python replay.py 回放文件.pvzr
+"""
+
+import struct
+
+from settings import GRID_ROWS, GRID_COLS
+from grid import Grid
+from simulation import create_simulation
+
+# 文件头：魔数、格式版本、后端、随机种子、结束帧号、草坪行数、列数
+REPLAY_MAGIC = b"PVZR"
+REPLAY_VERSION = 2
+HEADER_FORMAT = "<4sBBQIHH"
+# 每条输入：帧号、类型、两个参数（大草坪的世界坐标可能超过 16 位整数）
+EVENT_FORMAT = "<IBii"
+
+# 版本 1：没有草坪大小（默认草坪），参数为 16 位整数
+HEADER_FORMAT_V1 = "<4sBBQI"
+EVENT_FORMAT_V1 = "<IBhh"
+
+# 输入类型
+EVENT_PLANT = 1    # 参数：row, col
+EVENT_SHOVEL = 2   # 参数：鼠标 x, y
+EVENT_PAUSE = 3    # 参数：1 暂停 / 0 继续（暂停期间模拟不推进，回放时只作记录）
+
+BACKEND_CODES = {"sprite": 0, "numpy": 1, "lite": 2}
+
+class ReplayRecorder:
+    """
+    录制玩家输入
+    tick 统一使用 sim.tick_count：输入在推进第 tick + 1 帧之前生效
+    """
+
+    def __init__(self, seed, backend="sprite", lawn=None):
+        """
+        lawn: 草坪大小 (行数, 列数)，不传时使用默认大小
+        """
+        self.seed = seed
+        self.backend = backend
+        self.lawn = lawn if lawn is not None else (GRID_ROWS, GRID_COLS)
+        self.events = []
+
+    def plant(self, tick, row, col):
+        self.events.append((tick, EVENT_PLANT, row, col))
+
+    def shovel(self, tick, pos):
+        self.events.append((tick, EVENT_SHOVEL, pos[0], pos[1]))
+
+    def pause(self, tick, paused):
+        self.events.append((tick, EVENT_PAUSE, int(paused), 0))
+
+    def save(self, path, end_tick):
+        """
+        写入回放文件
+        end_tick: 录制结束时的逻辑帧号，回放会推进到这一帧
+        """
+        with open(path, "wb") as f:
+            f.write(struct.pack(
+                HEADER_FORMAT, REPLAY_MAGIC, REPLAY_VERSION,
+                BACKEND_CODES[self.backend], self.seed, end_tick, *self.lawn,
+            ))
+            for event in self.events:
+                f.write(struct.pack(EVENT_FORMAT, *event))
+
+def load_replay(path):
+    """
+    读取回放文件
+    返回 (seed, backend, end_tick, events, lawn)，lawn 为 (行数, 列数)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version = struct.unpack_from("<4sB", data)
+    if magic != REPLAY_MAGIC:
+        raise ValueError(f"不是回放文件：{path}")
+    if version == REPLAY_VERSION:
+        header_format, event_format = HEADER_FORMAT, EVENT_FORMAT
+        _, _, backend_code, seed, end_tick, rows, cols = struct.unpack_from(header_format, data)
+        lawn = (rows, cols)
+    elif version == 1:
+        header_format, event_format = HEADER_FORMAT_V1, EVENT_FORMAT_V1
+        _, _, backend_code, seed, end_tick = struct.unpack_from(header_format, data)
+        lawn = None
+    else:
+        raise ValueError(f"不支持的回放版本：{version}")
+    backend = {code: name for name, code in BACKEND_CODES.items()}[backend_code]
+    offset = struct.calcsize(header_format)
+    events = [event for event in struct.iter_unpack(event_format, data[offset:])]
+    return seed, backend, end_tick, events, lawn
+
+def apply_event(sim, event):
+    """
+    把一条录制的输入作用到模拟上
+    """
+    _, kind, a, b = event
+    if kind == EVENT_PLANT:
+        sim.add_plant(a, b)
+    elif kind == EVENT_SHOVEL:
+        sim.remove_plant_at((a, b))
+
+def play_replay(path, end_tick=None):
+    """
+    无渲染全速回放，返回回放结束时的模拟对象
+    end_tick: 推进到哪一帧，默认使用文件中记录的结束帧号
+    """
+    seed, backend, recorded_end, events, lawn = load_replay(path)
+    if end_tick is None:
+        end_tick = recorded_end
+
+    grid = Grid(*lawn) if lawn is not None else None
+    sim = create_simulation(grid, backend=backend, seed=seed)
+    index = 0
+    while sim.tick_count < end_tick and not sim.game_over:
+        # 注入在当前帧号录制的所有输入
+        while index < len(events) and events[index][0] <= sim.tick_count:
+            apply_event(sim, events[index])
+            index += 1
+        sim.step()
+    # 最后一帧之后录制的输入
+    while index < len(events) and events[index][0] <= sim.tick_count:
+        apply_event(sim, events[index])
+        index += 1
+    return sim
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) != 2:
+        print("用法：python replay.py 回放文件.pvzr")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    sim = play_replay(sys.argv[1])
+    elapsed = time.perf_counter() - start
+    plants, zombies, bullets = sim.entity_counts()
+    print(
+        f"回放到第 {sim.tick_count} 帧（游戏时间 {sim.time / 1000:.1f} 秒），耗时 {elapsed:.2f} 秒；"
+        f"植物 {plants}，僵尸 {zombies}，子弹 {bullets}，"
+        f"游戏结束: {sim.game_over}"
+    )
@@ -7,6 +7,25 @@
 SCREEN_WIDTH = 900      # 窗口宽度
 SCREEN_HEIGHT = 500     # 窗口高度
 FPS = 60                # 帧率
+SIM_TICK_MS = 1000 / FPS  # 逻辑固定步长（毫秒），与渲染帧率解耦
+MAX_CATCH_UP_TICKS = 5  # 渲染一帧最多补跑的逻辑帧数，防止卡顿后“死亡螺旋”
+FRAME_BUDGET_MS = 1000 / FPS  # 每帧（逻辑 + 绘制）的时间预算，超出时先降级绘制再跳帧
+MAX_RENDER_SKIP = 3     # 负载过高时最多连续跳过的绘制帧数
+DEGRADE_DETAIL_UNDER_LOAD = True  # 超出预算时是否先省略血量条和提示文字，再考虑跳帧
+TIME_SCALES = (1, 2, 4, 16)  # 可切换的游戏速度倍率（T 键循环切换），倍率越高每个渲染帧跑的逻辑帧越多
+RENDER_MODE = "full"    # 刷新模式："full"（每帧整屏重画）或 "dirty"（只刷新变化区域）
+HUD_TEXT_CACHE_SIZE = 64  # 界面文字渲染缓存的最大条目数
+PROFILER_HISTORY_FRAMES = 120  # 分阶段耗时统计保留的帧数（滚动平均窗口）
+AUTOSAVE_INTERVAL = 30_000  # 自动存档间隔（游戏时间，毫秒），配合 python main.py --autosave PATH 使用
+SIM_BACKEND = "sprite"  # 逻辑后端："sprite"（默认）、"numpy"（需要安装 numpy）或 "lite"（轻量实体，只用于无界面运行）
+WORKER_MAX_LAG_TICKS = 120  # python main.py --worker 时，逻辑子进程最多落后主进程多少帧，超出的帧直接丢弃
+WORKER_ENTITY_CAPACITY = 20000  # 实体数量不设上限时，共享内存中每种实体预留的条目数（超出的部分不绘制）
+
+# 界面字体：按顺序尝试这些字体文件，都不存在时按名字查找系统字体（第一次较慢，结果会缓存）
+FONT_CANDIDATES = ("C:/Windows/Fonts/msyh.ttc", "C:/Windows/Fonts/simhei.ttf")  # 微软雅黑、黑体
+FONT_FALLBACK_NAME = "simhei"
+FONT_SIZE = 24
+FONT_CACHE_FILE = "~/.simplified_pvz_font"  # 字体查找结果缓存（删除后下次启动重新查找）
 
 # 网格相关（类似植物大战僵尸的草坪）
 GRID_ROWS = 5           # 行数
@@ -14,6 +33,9 @@ GRID_COLS = 9           # 列数
 CELL_SIZE = 80          # 每个格子的像素大小
 GRID_OFFSET_X = 50      # 网格左边距
 GRID_OFFSET_Y = 50      # 网格上边距
+# 以上是默认草坪大小；运行时可以用 python main.py --lawn 20x200 指定更大的草坪，
+# 超出窗口的部分用方向键滚动查看
+CAMERA_SCROLL_SPEED = 600  # 方向键滚动视口的速度（像素/秒）
 
 # 颜色定义（RGB）
 WHITE = (255, 255, 255)
@@ -32,12 +54,22 @@ PLANT_FIRE_INTERVAL = 1000   # 开火间隔（毫秒），1000 = 1秒
 
 # 僵尸参数
 ZOMBIE_MAX_HP = 150          # 僵尸血量
-ZOMBIE_SPEED = 0.5           # 僵尸水平移动速度（像素/帧）
+ZOMBIE_SPEED = 1.0           # 僵尸水平移动速度（像素/帧，以 FPS 帧率为基准，实际位移按 dt 折算）
 
 # 子弹参数
-BULLET_SPEED = 5             # 子弹水平速度（像素/帧）
+BULLET_SPEED = 5             # 子弹水平速度（像素/帧，同上按 dt 折算）
 BULLET_DAMAGE = 25           # 子弹伤害
+BULLET_POOL_CAPACITY = 2000  # 子弹对象池上限：最多缓存这么多颗子弹循环使用
+# 本行前方没有僵尸的子弹是否立即销毁（而不是飞到屏幕右侧）
+# 注意：之后新生成的僵尸本来可能被这颗子弹打中，开启后玩法会略有不同，默认关闭
+DROP_MISSED_BULLETS = False
 
 # 僵尸生成（刷怪）参数
 ZOMBIE_SPAWN_INTERVAL = 100  # 生成间隔毫秒（2秒一个，值越小生成越快）
 
+# 实体数量上限（长时间运行时限制内存和每帧耗时），None 表示不限
+MAX_LIVE_ZOMBIES = 2000      # 同时存在的僵尸实体上限（一个僵尸群算一个），达到上限时暂停刷怪
+MAX_LIVE_BULLETS = 5000      # 同时存在的子弹上限，达到上限时植物推迟开火
+# 把同一行、同一位置、同一状态的僵尸合并成一个“僵尸群”实体（血量合计，伤害与逐只处理相同）
+ZOMBIE_HORDES = True
+
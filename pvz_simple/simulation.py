@@ -0,0 +1,445 @@
+"""
+无界面的游戏逻辑核心：
+- 持有植物、僵尸、子弹三个精灵组以及 plant_grid
+- 使用自己的模拟时钟（毫秒）和随机数生成器，不依赖 pygame.time 和显示窗口，
+  相同的随机种子 + 相同的输入得到完全相同的结果
+- step(dt) 推进一帧逻辑，run(ticks) 连续推进多帧，速度只受 CPU 限制
+- 同时存在的僵尸和子弹数量有上限；同一行、同一位置、同一状态的僵尸合并成一个“僵尸群”实体，
+  堆在植物前的几百只僵尸只占一个精灵，结果与逐只处理相同
+
+main() 负责窗口、输入和绘制，逻辑全部交给 Simulation。
+"""
+
+import random
+from bisect import bisect_left, bisect_right
+
+import pygame
+
+from settings import (
+    ZOMBIE_SPAWN_INTERVAL,
+    SIM_TICK_MS,
+    SIM_BACKEND,
+    DROP_MISSED_BULLETS,
+    MAX_LIVE_ZOMBIES,
+    MAX_LIVE_BULLETS,
+    ZOMBIE_HORDES,
+)
+from grid import Grid
+from entities import Plant, Zombie, Bullet, BulletPool
+from profiler import (
+    PHASE_SPAWN,
+    PHASE_UPDATE,
+    PHASE_FIRE,
+    PHASE_BULLET_HIT,
+    PHASE_ZOMBIE_BITE,
+    PHASE_HORDE,
+)
+
+def _zombie_left(zombie):
+    return zombie.rect.left
+
+class Simulation:
+    """
+    固定步长的游戏逻辑模拟：
+    - 不创建窗口，也不读取墙上时间，可以在 SDL dummy 驱动下或完全不初始化显示时运行
+    - 所有逻辑时间都来自 self.time（每次 step 累加 dt）
+    - 所有随机数都来自 self.rng
+    """
+
+    backend = "sprite"
+    # 实体和分组的类型；lite.LiteSimulation 换成不依赖 Sprite 的轻量版本
+    plant_class = Plant
+    zombie_class = Zombie
+    bullet_class = Bullet
+    group_class = pygame.sprite.Group
+
+    def __init__(self, grid=None, seed=None, endless=False):
+        """
+        grid: 草坪网格对象，不传则新建一个
+        seed: 随机种子，相同种子生成相同的僵尸序列
+        endless: 为 True 时僵尸突破防线不结束游戏，只移除该僵尸并计数（压力测试用）
+        """
+        self.grid = grid if grid is not None else Grid()
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # 精灵组：
+        self.plants = self.group_class()   # 所有植物
+        self.zombies = self.group_class()  # 所有僵尸
+        self.bullets = self.group_class()  # 所有子弹
+        # 子弹对象池：开火时取出，命中或飞出草坪右侧时 kill() 自动归还
+        self.bullet_pool = BulletPool(max_x=self.grid.world_width, bullet_class=self.bullet_class)
+
+        # 按行分桶的僵尸索引：僵尸生成时同时加入所在行的分组，
+        # 死亡时 kill() 会把它从所有分组中移除，因此 len() 就是该行实时的僵尸数量
+        self.lane_zombies = [self.group_class() for _ in range(self.grid.rows)]
+
+        # 用一个二维数组记录每个格子是否已经有植物（防止重复种植）
+        # None 表示该格子为空；否则存储 Plant 对象
+        self.plant_grid = [[None for _ in range(self.grid.cols)] for _ in range(self.grid.rows)]
+        # 植物的死亡回调：所有植物共用同一个绑定方法，不必每棵植物各生成一个
+        self._on_plant_death = self._clear_plant_slot
+
+        # 模拟时钟（毫秒）和已经推进的帧数
+        self.time = 0
+        self.tick_count = 0
+
+        # 僵尸生成计时器
+        self.last_zombie_spawn_time = 0
+
+        # 游戏结束标志
+        self.game_over = False
+        self.endless = endless
+        # 突破防线的僵尸数量和第一次突破时的帧号
+        self.breaches = 0
+        self.breach_tick = None
+        # 被子弹消灭的僵尸数量
+        self.kills = 0
+        # 因达到实体数量上限而没有生成的僵尸
+        self.spawns_skipped = 0
+
+        # 分阶段耗时统计（profiler.FrameProfiler），None 表示不统计
+        self.profiler = None
+
+    def add_plant(self, row, col):
+        """
+        在格子 (row, col) 种一棵植物
+        格子已有植物时不做任何事，返回 None；否则返回新植物
+        """
+        if self.plant_grid[row][col] is not None:
+            return None
+        cell_center = self.grid.get_cell_center(row, col)
+        new_plant = self.plant_class(cell_center, row, col)
+        # 植物死亡（被啃死或被铲除）时自己清理所在格子
+        new_plant.on_death = self._on_plant_death
+        self.plants.add(new_plant)
+        self.plant_grid[row][col] = new_plant
+        return new_plant
+
+    def _clear_plant_slot(self, plant):
+        if self.plant_grid[plant.row][plant.col] is plant:
+            self.plant_grid[plant.row][plant.col] = None
+
+    def remove_plant_at(self, pos):
+        """
+        铲子：移除像素坐标 pos 所在格子里的植物
+        返回 True 表示移除了一棵植物
+        """
+        cell_indices = self.grid.get_cell_indices_from_pos(pos)
+        if cell_indices is None:
+            return False
+        row, col = cell_indices
+        plant = self.plant_grid[row][col]
+        if plant is None:
+            return False
+        # 移除植物（on_death 回调会清理 plant_grid）
+        plant.kill()
+        return True
+
+    def _resolve_bullet_hits(self):
+        """
+        子弹与僵尸碰撞：子弹只在自己的行里向右飞，所以只需要和同一行的僵尸比较
+        每行的僵尸按左边缘 x 排好序，用二分查找找出与子弹横向重叠的那一段，
+        再用 colliderect 精确确认；结果与全量 groupcollide 相同
+        """
+        # 每行：按 x 排序的僵尸列表和对应的左边缘列表，只为有子弹的行建立
+        # 生成顺序本来就接近 x 的逆序，排序基本是线性的
+        lanes = {}
+        for bullet in self.bullets:
+            lane = lanes.get(bullet.row)
+            if lane is None:
+                ordered = sorted(self.lane_zombies[bullet.row], key=_zombie_left)
+                lane = lanes[bullet.row] = (ordered, [zombie.rect.left for zombie in ordered])
+            ordered, lefts = lane
+            rect = bullet.rect
+            if not ordered:
+                if DROP_MISSED_BULLETS:
+                    bullet.kill()
+                continue
+            # 所有僵尸大小相同：横向重叠 <=> rect.left - 宽度 < zombie.left < rect.right
+            zombie_width = ordered[0].rect.width
+            if DROP_MISSED_BULLETS and rect.left >= lefts[-1] + zombie_width:
+                # 前方已经没有僵尸
+                bullet.kill()
+                continue
+            lo = bisect_right(lefts, rect.left - zombie_width)
+            hi = bisect_left(lefts, rect.right)
+            hit = False
+            for zombie in ordered[lo:hi]:
+                if rect.colliderect(zombie.rect):
+                    hit = True
+                    if zombie.alive():
+                        self.kills += zombie.take_damage(bullet.damage)
+            if hit:
+                # 命中后删除子弹
+                bullet.kill()
+
+    def _add_zombie(self, zombie):
+        self.zombies.add(zombie)
+        self.lane_zombies[zombie.row].add(zombie)
+
+    def _merge_hordes(self):
+        """
+        同一行里位置、速度、攻击状态完全相同的僵尸今后的行为也完全相同，
+        把它们并入该行中最早加入的那一个，保持成员顺序不变
+        """
+        for lane in self.lane_zombies:
+            if len(lane) < 2:
+                continue
+            leaders = {}
+            for zombie in lane:
+                key = (zombie.x, zombie.speed, zombie.is_attacking)
+                leader = leaders.get(key)
+                if leader is None:
+                    leaders[key] = zombie
+                else:
+                    leader.absorb(zombie)
+
+    def _plants_in_contact(self, zombie):
+        """
+        依次返回与僵尸接触的植物：只查本行、僵尸身体覆盖的一两个格子，从前端（左边缘）所在的格子开始
+        """
+        rect = zombie.rect
+        lane_plants = self.plant_grid[zombie.row]
+        for col in self.grid.col_range(rect.left, rect.right):
+            plant = lane_plants[col]
+            if plant is not None and rect.colliderect(plant.rect):
+                yield plant
+
+    def zombie_total(self):
+        """
+        返回僵尸总数（僵尸群按成员数计算）
+        """
+        return sum(zombie.count for zombie in self.zombies)
+
+    def lane_zombie_count(self, row):
+        """
+        返回第 row 行当前存活的僵尸数量，O(1)
+        """
+        return len(self.lane_zombies[row])
+
+    def step(self, dt=SIM_TICK_MS):
+        """
+        推进一帧游戏逻辑
+        dt: 本帧经过的模拟毫秒数，默认使用固定步长 SIM_TICK_MS
+        """
+        if self.game_over:
+            return
+
+        self.time += dt
+        self.tick_count += 1
+        current_time = self.time
+        prof = self.profiler
+
+        # 2.1 生成僵尸（根据时间间隔）
+        if current_time - self.last_zombie_spawn_time >= ZOMBIE_SPAWN_INTERVAL:
+            self.last_zombie_spawn_time = current_time
+            # 随机选择一行
+            spawn_row = self.rng.randint(0, self.grid.rows - 1)
+            # 僵尸从世界右边缘生成（稍微靠内一点，确保立即可见）
+            spawn_x = self.grid.world_width - 20
+            # 找到这行中任意一个格子，取其 y 中心即可
+            _, spawn_y = self.grid.get_cell_center(spawn_row, 0)
+            if MAX_LIVE_ZOMBIES is None or len(self.zombies) < MAX_LIVE_ZOMBIES:
+                new_zombie = self.zombie_class((spawn_x, spawn_y), spawn_row)
+                self._add_zombie(new_zombie)
+            else:
+                # 达到上限：本次不生成（随机数照常消耗，不影响之后的刷怪序列）
+                self.spawns_skipped += 1
+        if prof is not None:
+            prof.mark(PHASE_SPAWN)
+
+        # 2.2 更新植物、僵尸、子弹
+        self.plants.update(dt)
+        self.zombies.update(dt)
+        self.bullets.update(dt)
+        if prof is not None:
+            prof.mark(PHASE_UPDATE)
+
+        # 2.3 植物自动开火（当前行有僵尸则开火）
+        # 子弹数量达到上限时，剩下的植物保持“可以开火”的状态，等有空位再开火
+        bullets_left = None if MAX_LIVE_BULLETS is None else MAX_LIVE_BULLETS - len(self.bullets)
+        for plant in self.plants:
+            # 直接查该行的僵尸分组，不再遍历所有僵尸
+            row_has_zombie = len(self.lane_zombies[plant.row]) > 0
+            if row_has_zombie and plant.can_fire(current_time):
+                if bullets_left is not None:
+                    if bullets_left <= 0:
+                        break
+                    bullets_left -= 1
+                plant.fire(self.bullets, current_time, self.bullet_pool)
+        if prof is not None:
+            prof.mark(PHASE_FIRE)
+
+        # 2.4 子弹与僵尸碰撞检测（按行排序 + 二分查找，不再全量两两比较）
+        self._resolve_bullet_hits()
+        if prof is not None:
+            prof.mark(PHASE_BULLET_HIT)
+
+        # 2.5 僵尸与植物碰撞检测
+        # 僵尸只会碰到本行、身体覆盖的一两个格子里的植物，直接查 plant_grid，不再遍历所有植物；
+        # 攻击状态在同一遍中重新计算
+        for zombie in self.zombies:
+            zombie.is_attacking = False
+            # 如果僵尸到达屏幕左侧（突破防线），判定游戏结束
+            if zombie.rect.left <= 0:
+                self.breaches += zombie.count
+                if self.breach_tick is None:
+                    self.breach_tick = self.tick_count
+                if self.endless:
+                    zombie.kill()
+                    continue
+                self.game_over = True
+                break
+
+            # 僵尸群的成员按加入顺序依次啃食，各自只攻击一个植物，与逐只处理相同
+            bites_left = zombie.count
+            for plant in self._plants_in_contact(zombie):
+                # 标记僵尸正在攻击植物（这样僵尸会停止移动）
+                zombie.is_attacking = True
+                # 僵尸在这一帧对植物造成伤害；植物被啃死后，剩下的成员去找下一个植物
+                while bites_left and plant.alive():
+                    plant.take_damage(zombie.attack_damage_per_frame)
+                    bites_left -= 1
+                if not bites_left:
+                    break  # 一个僵尸只攻击一个植物
+            if zombie.is_attacking and bites_left:
+                # 没有植物可啃的成员不再受阻挡，分出去单独前进
+                self._add_zombie(zombie.split(bites_left))
+        if prof is not None:
+            prof.mark(PHASE_ZOMBIE_BITE)
+
+        # 2.6 合并僵尸群：同一行、同一位置、同一状态的僵尸合并成一个实体
+        # （plant_grid 由植物的 on_death 回调维护，不需要每帧扫描）
+        if ZOMBIE_HORDES:
+            self._merge_hordes()
+        if prof is not None:
+            prof.mark(PHASE_HORDE)
+
+    def run(self, ticks, dt=SIM_TICK_MS):
+        """
+        连续推进 ticks 帧（游戏结束时提前停止）
+        返回实际推进的帧数
+        """
+        for i in range(ticks):
+            if self.game_over:
+                return i
+            self.step(dt)
+        return ticks
+
+    def sync_views(self, view=None):
+        """
+        渲染前的同步钩子：精灵本身就是状态，这里无需处理
+        view: 摄像机可见区域，与 ArraySimulation 接口一致（这里不使用）
+        """
+        pass
+
+    def entity_counts(self):
+        """
+        返回 (植物数, 僵尸数, 子弹数)；僵尸数按成员计算，与是否合并成僵尸群无关
+        """
+        return len(self.plants), self.zombie_total(), len(self.bullets)
+
+    def export_entities(self):
+        """
+        按字段导出全部实体（供 savestate.snapshot 使用），顺序与精灵组中的顺序一致
+        僵尸群展开成逐只僵尸，快照格式与是否合并无关
+        """
+        plants, bullets = self.plants.sprites(), self.bullets.sprites()
+        zombies, zombie_hps = [], []
+        for zombie in self.zombies:
+            for hp in zombie.member_hp_list():
+                zombies.append(zombie)
+                zombie_hps.append(hp)
+        return {
+            "plants": {
+                "row": [p.row for p in plants],
+                "col": [p.col for p in plants],
+                "hp": [p.hp for p in plants],
+                "last_fire": [p.last_fire_time for p in plants],
+            },
+            "zombies": {
+                "row": [z.row for z in zombies],
+                "x": [z.x for z in zombies],
+                "hp": zombie_hps,
+                "speed": [z.speed for z in zombies],
+                "attacking": [z.is_attacking for z in zombies],
+            },
+            "bullets": {
+                "row": [b.row for b in bullets],
+                "x": [b.x for b in bullets],
+                "speed": [b.speed for b in bullets],
+                "damage": [b.damage for b in bullets],
+            },
+        }
+
+    def import_entities(self, entities):
+        """
+        按 export_entities() 的格式重建全部实体（供 savestate.restore 使用，模拟应为刚创建的状态）
+        实体按原顺序加入精灵组，保证之后的碰撞处理顺序与保存前一致
+        """
+        p = entities["plants"]
+        for row, col, hp, last_fire in zip(p["row"], p["col"], p["hp"], p["last_fire"]):
+            plant = self.add_plant(row, col)
+            plant.hp = hp
+            plant.last_fire_time = last_fire
+
+        z = entities["zombies"]
+        for row, x, hp, speed, attacking in zip(z["row"], z["x"], z["hp"], z["speed"], z["attacking"]):
+            zombie = self.zombie_class(self.grid.get_cell_center(row, 0), row)
+            zombie.x = x
+            zombie.rect.x = round(x)
+            zombie.hp = hp
+            zombie.speed = speed
+            zombie.is_attacking = bool(attacking)
+            self._add_zombie(zombie)
+        if ZOMBIE_HORDES:
+            self._merge_hordes()
+
+        b = entities["bullets"]
+        for row, x, speed, damage in zip(b["row"], b["x"], b["speed"], b["damage"]):
+            bullet = self.bullet_pool.acquire(self.grid.get_cell_center(row, 0), row)
+            bullet.x = x
+            bullet.rect.x = round(x)
+            bullet.speed = speed
+            bullet.damage = damage
+            self.bullets.add(bullet)
+
+
+def create_simulation(grid=None, backend=SIM_BACKEND, seed=None, endless=False):
+    """
+    按 backend 创建逻辑模拟：
+    - "sprite": 每个实体一个精灵对象（Simulation）
+    - "numpy": 数组存储的 ArraySimulation；未安装 numpy 时打印提示并退回 "sprite"
+    - "lite": 使用 __slots__ 轻量实体的 LiteSimulation，没有图像，只用于无界面运行
+    seed / endless: 见 Simulation
+    """
+    if backend == "lite":
+        from lite import LiteSimulation
+        return LiteSimulation(grid, seed, endless)
+    if backend == "numpy":
+        try:
+            from array_backend import ArraySimulation
+            return ArraySimulation(grid, seed, endless)
+        except ImportError as e:
+            print(f"{e}，改用 sprite 后端")
+    return Simulation(grid, seed, endless)
+
+
+if __name__ == "__main__":
+    # 无窗口快速运行：种满草坪后推进 10 分钟游戏时间，打印模拟速度
+    import time
+
+    sim = Simulation(seed=0)
+    for row in range(sim.grid.rows):
+        for col in range(sim.grid.cols):
+            sim.add_plant(row, col)
+
+    start = time.perf_counter()
+    ticks = sim.run(int(10 * 60 * 1000 / SIM_TICK_MS))
+    elapsed = time.perf_counter() - start
+    print(
+        f"推进 {ticks} 帧（游戏时间 {sim.time / 1000:.1f} 秒），耗时 {elapsed:.2f} 秒，"
+        f"约 {sim.time / 1000 / max(elapsed, 1e-9):.0f} 游戏秒/秒；"
+        f"游戏结束: {sim.game_over}"
+    )
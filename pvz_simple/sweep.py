@@ -0,0 +1,222 @@
+"""
+数值平衡参数扫描：
+- 给定若干 settings 常量（SWEEP_PARAMS 中列出的数值参数）的取值（全组合，或从中随机抽样若干组）和一个固定的种植布局
+- 用 ProcessPoolExecutor 在多个进程里并行跑无界面对局，每局使用自己的一组参数
+- 汇总每组参数的存活时间、击杀数和第一次突破防线的帧号，输出为一张结果表（CSV）
+
+命令行用法：
+    python sweep.py ZOMBIE_SPAWN_INTERVAL=100,200,400 BULLET_DAMAGE=25,50 --layout front3 --seeds 4
+    python sweep.py ZOMBIE_MAX_HP=100,150,200,300 PLANT_FIRE_INTERVAL=500,1000 --random 5 --seconds 300
+    python sweep.py ZOMBIE_SPAWN_INTERVAL=1000,2000 --layout front1 --backend lite --fast-forward
+"""
+
+import csv
+import importlib
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from settings import GRID_ROWS, GRID_COLS, SIM_TICK_MS, SIM_BACKEND
+
+# 常量在导入时就被各模块按名字复制了一份，覆盖参数时要把这些模块里的同名变量一起改掉
+PATCHED_MODULES = ("settings", "entities", "simulation", "array_backend", "fastforward")
+
+# 可以扫描的参数：只有这些常量是在运行时从上面的模块里读取的，覆盖后确实会生效
+# （草坪大小、时间步长、对象池容量等在导入时就绑定成了默认参数或类属性，覆盖模块变量不起作用）
+SWEEP_PARAMS = (
+    "ZOMBIE_SPAWN_INTERVAL",
+    "ZOMBIE_MAX_HP",
+    "ZOMBIE_SPEED",
+    "PLANT_MAX_HP",
+    "PLANT_FIRE_INTERVAL",
+    "BULLET_SPEED",
+    "BULLET_DAMAGE",
+    "MAX_LIVE_ZOMBIES",
+    "MAX_LIVE_BULLETS",
+    "ZOMBIE_HORDES",
+    "DROP_MISSED_BULLETS",
+)
+
+# 预设布局：名称 -> [(row, col), ...]
+LAYOUTS = {
+    "none": [],
+    "front1": [(row, 0) for row in range(GRID_ROWS)],
+    "front3": [(row, col) for row in range(GRID_ROWS) for col in range(3)],
+    "full": [(row, col) for row in range(GRID_ROWS) for col in range(GRID_COLS)],
+}
+
+def parse_layout(text):
+    """
+    布局可以是预设名称，也可以是 "row:col,row:col,..." 形式的格子列表
+    """
+    if text in LAYOUTS:
+        return LAYOUTS[text]
+    cells = []
+    for item in text.split(","):
+        row, col = item.split(":")
+        cells.append((int(row), int(col)))
+    return cells
+
+# 开关和“不限数量”的取值
+KEYWORD_VALUES = {"None": None, "True": True, "False": False}
+
+def parse_value(text):
+    if text in KEYWORD_VALUES:
+        return KEYWORD_VALUES[text]
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_param(text):
+    """
+    "NAME=v1,v2,v3" -> ("NAME", [v1, v2, v3])
+    """
+    name, _, values = text.partition("=")
+    if not values:
+        raise ValueError(f"无法识别的参数：{text}（格式 NAME=v1,v2）")
+    if name not in SWEEP_PARAMS:
+        raise ValueError(f"不支持扫描的参数：{name}（可用：{', '.join(SWEEP_PARAMS)}）")
+    return name, [parse_value(v) for v in values.split(",")]
+
+def apply_overrides(overrides):
+    """
+    在当前进程中覆盖 settings 常量，返回原值，便于恢复
+    先导入 PATCHED_MODULES 中的全部模块再覆盖：之后才导入的模块（例如按需加载的 array_backend）
+    既记不下原值，又会从已被覆盖的 settings 复制到上一局的值
+    """
+    modules = {name: importlib.import_module(name) for name in PATCHED_MODULES}
+    original = {}
+    for module_name, module in modules.items():
+        for name, value in overrides.items():
+            if hasattr(module, name):
+                original[(module_name, name)] = getattr(module, name)
+                setattr(module, name, value)
+    return original
+
+def restore_overrides(original):
+    for (module_name, name), value in original.items():
+        setattr(sys.modules[module_name], name, value)
+
+def run_game(overrides, layout, seconds, seed, backend=SIM_BACKEND, fast=False):
+    """
+    在当前进程里跑一局（进程池中每个任务调用一次）
+    fast: 用事件驱动快进（fastforward.fast_forward）代替逐帧推进，结果相同
+    返回这一局的结果字典
+    """
+    from simulation import create_simulation
+    from fastforward import fast_forward
+
+    original = apply_overrides(overrides)
+    try:
+        sim = create_simulation(backend=backend, seed=seed)
+        for row, col in layout:
+            sim.add_plant(row, col)
+        ticks = int(seconds * 1000 / SIM_TICK_MS)
+        if fast:
+            fast_forward(sim, ticks)
+        else:
+            sim.run(ticks)
+        return {
+            **overrides,
+            "seed": seed,
+            "survival_s": sim.time / 1000,
+            "survived": not sim.game_over,
+            "kills": sim.kills,
+            "breach_tick": sim.breach_tick,
+        }
+    finally:
+        restore_overrides(original)
+
+def build_combinations(params, sample=None, rng=None):
+    """
+    params: [(name, [values...]), ...]
+    sample: 不为 None 时从全组合中随机抽取这么多组
+    """
+    names = [name for name, _ in params]
+    combos = [dict(zip(names, values)) for values in itertools.product(*(v for _, v in params))]
+    if sample is not None and sample < len(combos):
+        combos = (rng or random).sample(combos, sample)
+    return combos
+
+def aggregate(names, games):
+    """
+    按参数组合汇总多局结果
+    """
+    groups = {}
+    for game in games:
+        key = tuple(game[name] for name in names)
+        groups.setdefault(key, []).append(game)
+
+    rows = []
+    # None（不限数量）排在数值之后
+    order = lambda item: [(value is None, value if value is not None else 0) for value in item[0]]
+    for key, group in sorted(groups.items(), key=order):
+        breaches = [g["breach_tick"] for g in group if g["breach_tick"] is not None]
+        rows.append({
+            **dict(zip(names, key)),
+            "games": len(group),
+            "survival_mean_s": sum(g["survival_s"] for g in group) / len(group),
+            "survival_min_s": min(g["survival_s"] for g in group),
+            "survived": sum(g["survived"] for g in group),
+            "kills_mean": sum(g["kills"] for g in group) / len(group),
+            "breach_tick_mean": sum(breaches) / len(breaches) if breaches else None,
+        })
+    return rows
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="多进程数值平衡参数扫描")
+    parser.add_argument("params", nargs="+", help="参数取值，格式 NAME=v1,v2,...")
+    parser.add_argument("--layout", default="front3", help=f"种植布局：{'/'.join(LAYOUTS)} 或 row:col,row:col")
+    parser.add_argument("--seconds", type=float, default=300, help="每局最长游戏时间（秒）")
+    parser.add_argument("--seeds", type=int, default=3, help="每组参数跑几个随机种子")
+    parser.add_argument("--random", type=int, default=None, metavar="N", help="从全组合中随机抽取 N 组")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="进程数（默认 CPU 核数）")
+    parser.add_argument("--backend", default=SIM_BACKEND, choices=["sprite", "numpy", "lite"])
+    parser.add_argument("--fast-forward", action="store_true", help="事件驱动快进，跳过没有事件的帧（sprite / lite 后端）")
+    parser.add_argument("--output", default="sweep_results.csv", help="结果表 CSV 路径")
+    args = parser.parse_args(argv)
+    if args.fast_forward and args.backend == "numpy":
+        parser.error("--fast-forward 只支持 sprite / lite 后端")
+
+    try:
+        params = [parse_param(p) for p in args.params]
+    except ValueError as e:
+        parser.error(str(e))
+    names = [name for name, _ in params]
+    layout = parse_layout(args.layout)
+    combos = build_combinations(params, args.random, random.Random(0))
+    jobs = [(combo, seed) for combo in combos for seed in range(args.seeds)]
+
+    print(f"{len(combos)} 组参数 × {args.seeds} 个种子 = {len(jobs)} 局，{args.workers} 个进程")
+    start = time.perf_counter()
+    games = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(run_game, combo, layout, args.seconds, seed, args.backend, args.fast_forward)
+            for combo, seed in jobs
+        ]
+        for future in as_completed(futures):
+            games.append(future.result())
+    elapsed = time.perf_counter() - start
+
+    rows = aggregate(names, games)
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    for row in rows:
+        print("  ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
+    print(f"耗时 {elapsed:.1f} 秒，结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+逻辑与绘制分进程运行（main.py --worker）：
+- 子进程持有真正的模拟（sprite 后端换成结果相同、不带图像的 lite 后端），
+  按主进程发来的命令推进，每处理完一批命令就把实体状态写入共享内存
+- 共享内存（multiprocessing.shared_memory）里有两份状态缓冲区：子进程写不在使用中的那份，
+  写完再切换“当前缓冲区”下标；每份缓冲区带一个序号（写入期间为奇数），
+  主进程复制后序号没变且为偶数，才算读到一份完整的状态，否则重读
+- 主进程中的 RemoteSimulation 是模拟的代理，接口与 main() 用到的 Simulation 部分相同：
+  step() 只累计帧数，种植 / 铲除也只是发命令，命令通过轻量队列（SimpleQueue）按顺序送到子进程，
+  因此输入生效的逻辑帧号与单进程运行时相同，录制的回放照常可以重现
+- sync_views() 读取最新的完整状态，为视野内的实体生成 EntityView 交给 Renderer 绘制
+
+子进程落后主进程超过 WORKER_MAX_LAG_TICKS 帧时，多出来的帧直接丢弃（与 FramePacer 丢弃补跑时间相同）
+"""
+
+import struct
+import time
+from array import array
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import pygame
+
+from settings import (
+    SIM_TICK_MS,
+    SIM_BACKEND,
+    PLANT_MAX_HP,
+    ZOMBIE_MAX_HP,
+    MAX_LIVE_ZOMBIES,
+    MAX_LIVE_BULLETS,
+    WORKER_MAX_LAG_TICKS,
+    WORKER_ENTITY_CAPACITY,
+)
+from grid import Grid
+from entities import Plant, Zombie, Bullet
+from assets import SPRITE_CACHE
+from array_backend import EntityView, BAR_MARGIN
+from simulation import Simulation, create_simulation
+
+# 共享内存开头的控制区：当前缓冲区下标 (uint32) + 两份缓冲区各自的序号 (uint64)
+CONTROL_FORMAT = "<I4xQQ"
+CONTROL_SIZE = struct.calcsize(CONTROL_FORMAT)
+SEQ_OFFSETS = (8, 16)
+
+# 每份缓冲区的帧头：逻辑帧号、模拟时钟、已处理的命令数、击杀数、突破次数、是否结束、
+# entity_counts() 的植物数、僵尸数（按成员计算）、子弹数，
+# 以及写入的植物、僵尸（僵尸群算一个）、子弹条目数（超出容量的实体不写入，按实际写入的算）
+FRAME_FORMAT = "<QdQII?IIIIII"
+FRAME_SIZE = struct.calcsize(FRAME_FORMAT)
+
+# 每种实体按列存放：(字段, array 类型码)
+COLUMNS = {
+    "plants": (("row", "i"), ("col", "i"), ("hp", "d")),
+    "zombies": (("row", "i"), ("x", "d"), ("hp", "d"), ("max_hp", "d")),
+    "bullets": (("row", "i"), ("x", "d")),
+}
+KINDS = ("plants", "zombies", "bullets")
+
+class StateLayout:
+    """
+    共享内存的布局：由草坪大小和实体容量决定，主进程和子进程各自按相同参数计算
+    """
+
+    def __init__(self, rows, cols):
+        self.capacity = {
+            "plants": rows * cols,
+            "zombies": MAX_LIVE_ZOMBIES or WORKER_ENTITY_CAPACITY,
+            "bullets": MAX_LIVE_BULLETS or WORKER_ENTITY_CAPACITY,
+        }
+        # columns[kind] = [(字段, 类型码, 在缓冲区内的偏移), ...]
+        self.columns = {}
+        offset = FRAME_SIZE
+        for kind in KINDS:
+            self.columns[kind] = []
+            for name, typecode in COLUMNS[kind]:
+                self.columns[kind].append((name, typecode, offset))
+                offset += array(typecode).itemsize * self.capacity[kind]
+        self.buffer_size = offset
+        self.size = CONTROL_SIZE + 2 * self.buffer_size
+
+    def buffer_offset(self, index):
+        return CONTROL_SIZE + index * self.buffer_size
+
+class StateWriter:
+    """
+    子进程一侧：把模拟状态写入不在使用中的缓冲区，写完后切换
+    """
+
+    def __init__(self, buf, layout):
+        self.buf = buf
+        self.layout = layout
+        self.active = 0
+        self.seqs = [0, 0]
+
+    def publish(self, header, entities):
+        """
+        header: FRAME_FORMAT 中除最后三个条目数以外的字段
+        entities: {kind: {字段: [值, ...]}}
+        """
+        buf, layout = self.buf, self.layout
+        index = 1 - self.active
+        base = layout.buffer_offset(index)
+        seq_offset = SEQ_OFFSETS[index]
+        self.seqs[index] += 1  # 奇数：正在写入
+        struct.pack_into("<Q", buf, seq_offset, self.seqs[index])
+
+        counts = []
+        for kind in KINDS:
+            fields = entities[kind]
+            count = min(len(fields["row"]), layout.capacity[kind])
+            counts.append(count)
+            for name, typecode, offset in layout.columns[kind]:
+                data = array(typecode, fields[name][:count]).tobytes()
+                start = base + offset
+                buf[start:start + len(data)] = data
+        struct.pack_into(FRAME_FORMAT, buf, base, *header, *counts)
+
+        self.seqs[index] += 1  # 偶数：写入完成
+        struct.pack_into("<Q", buf, seq_offset, self.seqs[index])
+        struct.pack_into("<I", buf, 0, index)
+        self.active = index
+
+class StateReader:
+    """
+    主进程一侧：复制当前缓冲区，序号校验通过才返回
+    """
+
+    def __init__(self, buf, layout):
+        self.buf = buf
+        self.layout = layout
+
+    def read(self, attempts=100):
+        """
+        返回 (帧头元组, {kind: {字段: [值, ...]}})；子进程一直在改写时返回 None，下一帧再读
+        """
+        buf, layout = self.buf, self.layout
+        for _ in range(attempts):
+            index = struct.unpack_from("<I", buf, 0)[0]
+            seq_offset = SEQ_OFFSETS[index]
+            seq = struct.unpack_from("<Q", buf, seq_offset)[0]
+            if seq == 0 or seq % 2:
+                continue
+            base = layout.buffer_offset(index)
+            header = struct.unpack_from(FRAME_FORMAT, buf, base)
+            counts = header[-3:]
+            entities = {}
+            for kind, count in zip(KINDS, counts):
+                fields = {}
+                for name, typecode, offset in layout.columns[kind]:
+                    column = array(typecode)
+                    start = base + offset
+                    column.frombytes(buf[start:start + column.itemsize * count])
+                    fields[name] = column
+                entities[kind] = fields
+            if struct.unpack_from("<Q", buf, seq_offset)[0] == seq:
+                return header, entities
+        return None
+
+def _collect(sim):
+    """
+    取出需要绘制的实体字段；僵尸群按一个实体输出（血量条显示全体合计）
+    """
+    if isinstance(sim, Simulation):
+        plants, zombies, bullets = sim.plants, sim.zombies, sim.bullets
+        return {
+            "plants": {
+                "row": [p.row for p in plants], "col": [p.col for p in plants], "hp": [p.hp for p in plants],
+            },
+            "zombies": {
+                "row": [z.row for z in zombies], "x": [z.x for z in zombies],
+                "hp": [z.hp for z in zombies], "max_hp": [z.max_hp for z in zombies],
+            },
+            "bullets": {"row": [b.row for b in bullets], "x": [b.x for b in bullets]},
+        }
+    # numpy 后端没有僵尸群，每只僵尸的血量上限相同
+    entities = sim.export_entities()
+    zombies = entities["zombies"]
+    zombies["max_hp"] = [ZOMBIE_MAX_HP] * len(zombies["row"])
+    return entities
+
+def _worker_main(shm_name, commands, lawn, backend, seed):
+    """
+    子进程入口：依次执行命令，命令队列暂时取空时发布一次状态
+    命令："step" 推进若干帧，"plant" 种植，"shovel" 铲除，"quit" 退出
+    """
+    # 共享内存由主进程创建和释放（spawn 启动的子进程与主进程共用同一个 resource_tracker）
+    shm = SharedMemory(name=shm_name)
+    grid = Grid(*lawn)
+    sim = create_simulation(grid, backend=backend, seed=seed)
+    writer = StateWriter(shm.buf, StateLayout(*lawn))
+    processed = 0
+
+    def publish():
+        header = (sim.tick_count, sim.time, processed, sim.kills, sim.breaches, sim.game_over, *sim.entity_counts())
+        writer.publish(header, _collect(sim))
+
+    try:
+        publish()
+        while True:
+            command = commands.get()
+            kind = command[0]
+            if kind == "quit":
+                break
+            if kind == "step":
+                for _ in range(command[1]):
+                    if sim.game_over:
+                        break
+                    sim.step(SIM_TICK_MS)
+            elif kind == "plant":
+                sim.add_plant(command[1], command[2])
+            elif kind == "shovel":
+                sim.remove_plant_at(command[1])
+            processed += 1
+            if commands.empty():
+                publish()
+    finally:
+        shm.close()
+
+class RemoteSimulation:
+    """
+    子进程中运行的模拟在主进程中的代理
+    tick_count 是已经交给子进程的帧数：输入命令排在这些帧之后，生效帧号与单进程时相同
+    """
+
+    def __init__(self, grid, backend=SIM_BACKEND, seed=None):
+        self.grid = grid
+        self.backend = backend
+        self.seed = seed
+        self.profiler = None  # 逻辑阶段在子进程中运行，主进程不统计
+        self.plants = pygame.sprite.Group()
+        self.zombies = pygame.sprite.Group()
+        self.bullets = pygame.sprite.Group()
+        self.tick_count = 0
+        self.time = 0.0
+        self.kills = 0
+        self.breaches = 0
+        self.game_over = False
+        self.dropped_ticks = 0
+        self.published_tick = 0
+
+        self._pending_steps = 0
+        self._sent = 0        # 已发送的命令数
+        self._processed = 0   # 子进程已处理的命令数（来自最新状态）
+        self._occupied = set()            # 最新状态中有植物的格子
+        self._pending_plants = {}         # 格子 -> 种植命令的序号
+        self._pending_removals = {}       # 格子 -> 铲除命令的序号
+        self._entities = None
+        self._counts = (0, 0, 0)
+        self._views = {kind: [] for kind in KINDS}
+
+        lawn = (grid.rows, grid.cols)
+        self._layout = StateLayout(*lawn)
+        self._shm = SharedMemory(create=True, size=self._layout.size)
+        self._reader = StateReader(self._shm.buf, self._layout)
+        # 用 spawn 启动：主进程已经初始化了 SDL 窗口，不能 fork
+        context = get_context("spawn")
+        self._commands = context.SimpleQueue()
+        # sprite 后端的实体图像在子进程里用不到，换成结果相同的 lite 后端
+        worker_backend = "lite" if backend == "sprite" else backend
+        self._process = context.Process(
+            target=_worker_main,
+            args=(self._shm.name, self._commands, lawn, worker_backend, seed),
+            daemon=True,
+        )
+        try:
+            self._process.start()
+            self._wait_ready()
+        except BaseException:
+            # 启动失败时结束子进程并释放共享内存，避免留下无人清理的内存段
+            if self._process.pid is not None:
+                self._process.terminate()
+                self._process.join(timeout=2)
+            self._commands.close()
+            self._shm.close()
+            self._shm.unlink()
+            raise
+
+    def _wait_ready(self, timeout=10.0):
+        """
+        等子进程发布第一份状态再开始游戏，避免启动期间主进程推进的帧因为落后太多被丢弃
+        """
+        deadline = time.monotonic() + timeout
+        while self._reader.read(attempts=1) is None:
+            if not self._process.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("逻辑子进程启动失败")
+            time.sleep(0.005)
+
+    def _send(self, *command):
+        self._commands.put(command)
+        self._sent += 1
+        return self._sent
+
+    def _flush(self):
+        if self._pending_steps:
+            self._send("step", self._pending_steps)
+            self._pending_steps = 0
+
+    def step(self, dt=SIM_TICK_MS):
+        """
+        推进一帧：只累计帧数，下一次同步或发送输入时一起交给子进程
+        """
+        if self.game_over:
+            return
+        if self.tick_count - self.published_tick >= WORKER_MAX_LAG_TICKS:
+            self.dropped_ticks += 1
+            return
+        self._pending_steps += 1
+        self.tick_count += 1
+
+    def add_plant(self, row, col):
+        """
+        按最新状态判断格子是否空着，空着则发送种植命令
+        返回 True 表示已发送（植物只会由命令产生，所以判断不会过时），否则返回 None
+        """
+        cell = (row, col)
+        if self.game_over or cell in self._occupied or cell in self._pending_plants:
+            return None
+        self._flush()
+        self._pending_plants[cell] = self._send("plant", row, col)
+        return True
+
+    def remove_plant_at(self, pos):
+        """
+        按最新状态判断格子里是否有植物，有则发送铲除命令
+        返回 True 表示已发送
+        """
+        cell = self.grid.get_cell_indices_from_pos(pos)
+        if self.game_over or cell is None or cell in self._pending_removals:
+            return False
+        if cell not in self._occupied and cell not in self._pending_plants:
+            return False
+        self._flush()
+        self._pending_removals[cell] = self._send("shovel", pos)
+        return True
+
+    def _poll(self):
+        """
+        读取最新的完整状态，更新计数和格子占用情况
+        """
+        self._flush()
+        state = self._reader.read()
+        if state is None:
+            return
+        header, entities = state
+        tick, self.time, processed, self.kills, self.breaches, game_over = header[:6]
+        self.published_tick = tick
+        if game_over and not self.game_over:
+            # 结束后多发的帧没有执行，帧号以子进程为准
+            self.game_over = True
+            self.tick_count = tick
+        self._processed = processed
+        for pending in (self._pending_plants, self._pending_removals):
+            for cell, seq in list(pending.items()):
+                if seq <= processed:
+                    del pending[cell]
+        plants = entities["plants"]
+        self._occupied = set(zip(plants["row"], plants["col"]))
+        self._entities = entities
+        self._counts = header[6:9]
+
+    def sync_views(self, view=None):
+        """
+        渲染前同步：按最新状态为视野内的实体生成视图
+        """
+        self._poll()
+        entities = self._entities
+        if entities is None:
+            return
+        grid = self.grid
+        size = grid.cell_size
+        images = {
+            "plants": SPRITE_CACHE.get("plant", Plant.build_image),
+            "zombies": SPRITE_CACHE.get("zombie", Zombie.build_image),
+            "bullets": SPRITE_CACHE.get("bullet", Bullet.build_image),
+        }
+        groups = {"plants": self.plants, "zombies": self.zombies, "bullets": self.bullets}
+        for kind in KINDS:
+            fields = entities[kind]
+            width, height = images[kind].get_size()
+            rows = fields["row"]
+            tops = [grid.offset_y + row * size + size // 2 - height // 2 for row in rows]
+            if kind == "plants":
+                lefts = [grid.offset_x + col * size + size // 2 - width // 2 for col in fields["col"]]
+            else:
+                lefts = [round(x) for x in fields["x"]]
+            hps = fields.get("hp")
+            max_hps = fields.get("max_hp")
+            visible = []
+            for i, (left, top) in enumerate(zip(lefts, tops)):
+                if view is not None and not (
+                    left + width > view.left and left < view.right
+                    and top + height > view.top - BAR_MARGIN and top < view.bottom
+                ):
+                    continue
+                visible.append(i)
+            self._sync_group(kind, groups[kind], images[kind], visible, lefts, tops, hps, max_hps)
+
+    def _sync_group(self, kind, group, image, visible, lefts, tops, hps, max_hps):
+        # 视图对象按顺序复用，数量变化时只增删末尾的几个，绘制顺序与状态中的顺序一致
+        views = self._views[kind]
+        while len(views) < len(visible):
+            views.append(EntityView(image, 1))
+        for view in views[len(visible):len(group)]:
+            group.remove(view)
+        for view, i in zip(views, visible):
+            view.rect.topleft = (lefts[i], tops[i])
+            if hps is not None:
+                view.hp = hps[i]
+                view.max_hp = max_hps[i] if max_hps is not None else PLANT_MAX_HP
+            group.add(view)
+
+    def entity_counts(self):
+        """
+        返回上一次读取的状态中的 (植物数, 僵尸数, 子弹数)，不再重新复制共享内存
+        主循环每帧都会调用，顺便把本帧累计的帧数发给子进程（跳过绘制的帧不会调用 sync_views()）
+        """
+        self._flush()
+        return self._counts
+
+    def close(self):
+        """
+        通知子进程退出并释放共享内存
+        """
+        if self._process.is_alive():
+            self._commands.put(("quit",))
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._commands.close()
+        self._shm.close()
+        self._shm.unlink()